@@ -0,0 +1,667 @@
+# Importing libraries
+import argparse
+import contextlib
+import glob
+import json
+import multiprocessing
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import openpyxl
+import pandas as pd
+from PIL import Image
+
+from csv_xlsx_to_pdf.core import read_xlsx
+from csv_xlsx_to_pdf.images import IMAGE_NOT_FOUND
+from csv_xlsx_to_pdf.metrics import Metrics
+from csv_xlsx_to_pdf.pipeline import convert
+from csv_xlsx_to_pdf.renderers.docx import CONVERTERS, create_word_document
+from csv_xlsx_to_pdf.renderers.html import create_pdf, create_pdf_batch, generate_html
+from csv_xlsx_to_pdf.renderers.native import create_pdf_document
+from csv_xlsx_to_pdf.service import RenderService, create_server
+
+
+# Create the data dictionary of a sample product
+def sample_data(index):
+    return {
+        "Token": "T" + str(index),
+        "ProductPrimaryToken": "P" + str(index),
+        "Name_es": "Producto de prueba " + str(index),
+        "ProductSection_T2_INFO_es": "Descripción del producto de prueba " * 10,
+        "Image_ProductPrimary": "",
+        "Attribute_BulletPointsProducto": "- Primer punto\r\n- Segundo punto\r\n- Tercer punto",
+        "Characteristics": {
+            "Attribute_Caracteristica" + str(i): "Valor " + str(i) for i in range(12)
+        },
+        "Attributes": {"Attribute_Atributo" + str(i): "Valor " + str(i) for i in range(8)},
+    }
+
+
+# Render the documents in batches of batch_size and return the seconds per document
+def benchmark_batch_size(html_contents, batch_size):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        documents = [
+            (html_content, os.path.join(temp_dir, str(index) + ".pdf"))
+            for index, html_content in enumerate(html_contents)
+        ]
+
+        start = time.perf_counter()
+        for i in range(0, len(documents), batch_size):
+            batch = documents[i : i + batch_size]
+            if len(batch) == 1:
+                create_pdf(*batch[0])
+            else:
+                create_pdf_batch(batch)
+        elapsed = time.perf_counter() - start
+
+    return elapsed / len(documents)
+
+
+# Compare the per-document latency of the html backend for different batch sizes
+def benchmark_html_batches(documents, batch_sizes):
+    html_contents = [generate_html(sample_data(index)) for index in range(documents)]
+
+    print("Rendering " + str(documents) + " documents...")
+    print(f"{'batch size':>10}  {'ms/document':>12}  {'speedup':>8}")
+
+    baseline = None
+    for batch_size in batch_sizes:
+        seconds = benchmark_batch_size(html_contents, batch_size)
+        baseline = baseline or seconds
+        print(f"{batch_size:>10}  {seconds * 1000:>12.1f}  {baseline / seconds:>7.2f}x")
+
+
+# Generate the html content of the documents and print the throughput
+def benchmark_html(documents):
+    rows = [sample_data(index) for index in range(documents)]
+
+    start = time.perf_counter()
+    for data in rows:
+        generate_html(data)
+    elapsed = time.perf_counter() - start
+
+    print("Generating the html content of " + str(documents) + " documents...")
+    print(f"{documents / elapsed:.0f} documents/s, {elapsed / documents * 1e6:.1f} us/document")
+
+
+# Write the sample documents to the staging folder and return their paths
+def write_documents(docx_contents, staging_dir):
+    docx_files = []
+
+    for index, docx_content in enumerate(docx_contents):
+        docx_file = os.path.join(staging_dir, "P" + str(index) + "_T" + str(index) + ".docx")
+        with open(docx_file, "wb") as file:
+            file.write(docx_content)
+        docx_files.append(docx_file)
+
+    return docx_files
+
+
+# Convert the documents one by one and return the seconds per document
+def benchmark_per_file(docx_contents, converter):
+    with tempfile.TemporaryDirectory() as staging_dir, tempfile.TemporaryDirectory() as output_dir:
+        docx_files = write_documents(docx_contents, staging_dir)
+
+        start = time.perf_counter()
+        for docx_file in docx_files:
+            converter(docx_file, output_dir)
+        elapsed = time.perf_counter() - start
+
+    return elapsed / len(docx_contents)
+
+
+# Convert the documents with a single pass over the staging folder and return the seconds per document
+def benchmark_bulk(docx_contents, converter):
+    with tempfile.TemporaryDirectory() as staging_dir, tempfile.TemporaryDirectory() as output_dir:
+        write_documents(docx_contents, staging_dir)
+
+        start = time.perf_counter()
+        converter(staging_dir, output_dir)
+        elapsed = time.perf_counter() - start
+
+    return elapsed / len(docx_contents)
+
+
+# Compare per-file and bulk conversion of the docx backend
+def benchmark_docx(documents, converter_name):
+    converter = CONVERTERS[converter_name]
+    docx_contents = [create_word_document(sample_data(index), None) for index in range(documents)]
+
+    print("Converting " + str(documents) + " documents with " + converter_name + "...")
+    per_file = benchmark_per_file(docx_contents, converter)
+    bulk = benchmark_bulk(docx_contents, converter)
+
+    print(f"{'per-file':>10}  {per_file * 1000:>10.1f} ms/document")
+    print(f"{'bulk':>10}  {bulk * 1000:>10.1f} ms/document  ({per_file / bulk:.2f}x)")
+
+
+# Draw the documents with the native backend in a pool of worker processes and print the seconds per document
+def benchmark_native(documents, workers):
+    rows = [sample_data(index) for index in range(documents)]
+
+    print("Drawing " + str(documents) + " documents with " + str(workers) + " workers...")
+
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for _ in executor.map(create_pdf_document, rows, [None] * documents):
+            pass
+    elapsed = time.perf_counter() - start
+
+    print(f"{'native':>10}  {elapsed / documents * 1000:>10.1f} ms/document")
+
+
+# Load the xlsx file with the whole workbook in memory and every cell cast to a string, like the script used to
+def read_xlsx_full(file_path):
+    wb = openpyxl.load_workbook(file_path)
+    df = pd.DataFrame(wb[wb.sheetnames[0]].values)
+    df.columns = df.iloc[0]
+
+    return df.astype(str)
+
+
+# Load nothing, to measure the memory used by the interpreter and the imported libraries
+def read_nothing(file_path):
+    return None
+
+
+# Load the file in this process and send back the load time and the peak memory in MB
+def measure_loader(loader, file_path, queue):
+    import resource
+
+    start = time.perf_counter()
+    loader(file_path)
+    elapsed = time.perf_counter() - start
+
+    queue.put((elapsed, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024))
+
+
+# Compare the load time and peak memory of the xlsx readers, every reader runs in a fresh process
+def benchmark_xlsx(file_path):
+    context = multiprocessing.get_context("spawn")
+
+    print("Loading " + file_path + "...")
+    print(f"{'reader':>12}  {'seconds':>8}  {'peak MB':>8}")
+
+    for name, loader in [
+        ("imports", read_nothing),
+        ("full", read_xlsx_full),
+        ("read-only", read_xlsx),
+    ]:
+        queue = context.Queue()
+        process = context.Process(target=measure_loader, args=(loader, file_path, queue))
+        process.start()
+        elapsed, peak = queue.get()
+        process.join()
+
+        print(f"{name:>12}  {elapsed:>8.2f}  {peak:>8.0f}")
+
+
+# Columns of the synthetic catalogues before the Attribute_ columns, in the order of data.csv
+CATALOGUE_COLUMNS = [
+    "CategoryToken_1", "Token", "ProductPrimaryToken", "Name_es", "ProductSection_T2_INFO_es",
+    "ShortDescription_es", "Image_ProductPrimary", "Attribute_Etiquetas", "Attribute_BulletPointsProducto",
+]
+
+# Words of the synthetic names, descriptions and attribute values
+WORDS = [
+    "pila", "recargable", "luz", "exterior", "interior", "bombilla", "jarra", "planta", "insectos", "potencia",
+    "alimentación", "protección", "temperatura", "material", "volumen", "formato", "carga", "sensor", "cámara",
+]
+
+
+# Create a synthetic catalogue with the schema of data.csv and save it as a csv or xlsx file.
+# The first half of the attribute columns have the same value for all the variants of a ProductPrimaryToken,
+# so they become its characteristics, and sparsity is the fraction of empty attribute values
+def generate_catalogue(file_path, rows, attributes, variants, sparsity, image_url, seed=0):
+    generator = random.Random(seed)
+    attribute_columns = ["Attribute_Atributo" + str(i) for i in range(attributes)]
+    characteristic_columns = attribute_columns[: attributes // 2]
+
+    def words(count):
+        return " ".join(generator.choice(WORDS) for _ in range(count))
+
+    def value():
+        return "" if generator.random() < sparsity else words(2)
+
+    records = []
+    for index in range(rows):
+        # Start a new ProductPrimaryToken every variants rows
+        variant = index % variants
+        if variant == 0:
+            primary_token = "P" + str(index // variants).zfill(7)
+            characteristics = {column: value() for column in characteristic_columns}
+            name = words(4).capitalize()
+            description = words(60).capitalize() + "."
+            bullet_points = "\r\n".join("- " + words(5) for _ in range(generator.randint(2, 5)))
+
+        record = {
+            "CategoryToken_1": "C" + str(generator.randint(1, 20)),
+            "Token": primary_token + "-" + str(variant),
+            "ProductPrimaryToken": primary_token,
+            "Name_es": name + " " + str(variant),
+            "ProductSection_T2_INFO_es": description,
+            "ShortDescription_es": name,
+            "Image_ProductPrimary": image_url + "/" + primary_token + ".png",
+            "Attribute_Etiquetas": words(1),
+            "Attribute_BulletPointsProducto": bullet_points,
+        }
+        for column in attribute_columns:
+            record[column] = characteristics[column] if column in characteristics else value()
+        records.append(record)
+
+    df = pd.DataFrame(records, columns=CATALOGUE_COLUMNS + attribute_columns)
+    if file_path.endswith(".xlsx"):
+        df.to_excel(file_path, index=False)
+    else:
+        df.to_csv(file_path, sep=";", index=False)
+
+
+# Create a noisy jpeg photo of size x size pixels at print quality, like the images of the suppliers
+def sample_photo(size):
+    noise = [Image.effect_noise((size, size), 40 + 20 * band) for band in range(3)]
+    photo = Image.merge("RGB", noise)
+
+    output = BytesIO()
+    photo.save(output, "JPEG", quality=95)
+
+    return output.getvalue()
+
+
+# Local stand-in for the image server, every url returns the same photo of size x size pixels,
+# or the image-not-found picture when size is 0
+class ImageServer:
+    def __init__(self, size=2000):
+        if size:
+            image_content = sample_photo(size)
+        else:
+            with open(IMAGE_NOT_FOUND, "rb") as file:
+                image_content = file.read()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                self.send_response(200)
+                self.send_header("Content-Type", "image/jpeg" if size else "image/png")
+                self.send_header("Content-Length", str(len(image_content)))
+                self.end_headers()
+                self.wfile.write(image_content)
+
+            def log_message(self, format, *args):
+                pass
+
+        self.requests = 0
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = "http://127.0.0.1:" + str(self.httpd.server_address[1])
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+# Convert a catalogue with a backend in an empty folder and return the seconds of every stage
+def run_catalogue(file_path, backend, workers, options):
+    metrics = Metrics()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        cwd = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            # The progress messages of the run are not printed
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                convert(file_path, backend=backend, workers=workers, force=True, metrics=metrics, **options)
+        finally:
+            os.chdir(cwd)
+
+        # The renderers print the errors of the rows, a run is only measured when every pdf file was created
+        summary = metrics.summary()
+        pdf_files = glob.glob(os.path.join(work_dir, "PDF", "*", "*.pdf"))
+        created = len(pdf_files)
+        output_bytes = sum(os.path.getsize(pdf_file) for pdf_file in pdf_files)
+        if created < summary["counts"].get("created", 0):
+            raise RuntimeError(
+                "only " + str(created) + " of " + str(summary["counts"]["created"]) + " pdf files were created"
+            )
+
+    stages = summary["stages"]
+
+    def total(*names):
+        return sum(stages[name]["total_seconds"] for name in names if name in stages)
+
+    return {
+        "wall_seconds": summary["wall_seconds"],
+        "rows_per_second": summary["rows_per_second"],
+        "read_seconds": total("read"),
+        "extract_seconds": total("extract"),
+        "render_seconds": total("render", "finish"),
+        "document_p95": stages["document"]["p95"] if "document" in stages else None,
+        "output_bytes": output_bytes,
+    }
+
+
+# Last result of the same catalogue and backend in a results file, None when there is none
+def load_baseline(results_file, result):
+    if not results_file or not os.path.exists(results_file):
+        return None
+
+    keys = ["backend", "rows", "attributes", "variants", "sparsity", "seed", "format", "workers", "image_size",
+            "image_dpi"]
+    baseline = None
+    with open(results_file, encoding="utf-8") as file:
+        for line in file:
+            previous = json.loads(line)
+            if previous.get("error") is None and all(previous.get(key) == result[key] for key in keys):
+                baseline = previous
+
+    return baseline
+
+
+# Generate the synthetic catalogues of every size, convert them with every backend while the images are
+# served locally, print the seconds of ingestion, extraction and rendering and append them to the results file
+def benchmark_suite(sizes, backends, attributes, variants, sparsity, seed, file_format, image_size, workers, options,
+                    results_file, compare_file):
+    print(f"{'rows':>8}  {'backend':>8}  {'read s':>8}  {'extract s':>9}  {'render s':>9}  "
+          f"{'wall s':>8}  {'rows/s':>8}  {'out MB':>8}  {'vs base':>8}")
+
+    with ImageServer(image_size) as image_server, tempfile.TemporaryDirectory() as data_dir:
+        for rows in sizes:
+            file_path = os.path.join(data_dir, "catalogue_" + str(rows) + "." + file_format)
+            generate_catalogue(file_path, rows, attributes, variants, sparsity, image_server.url, seed)
+
+            for backend in backends:
+                result = {
+                    "date": datetime.now().isoformat(timespec="seconds"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "backend": backend,
+                    "rows": rows,
+                    "attributes": attributes,
+                    "variants": variants,
+                    "sparsity": sparsity,
+                    "seed": seed,
+                    "format": file_format,
+                    "workers": workers,
+                    "image_size": image_size,
+                    "image_dpi": options["image_dpi"],
+                    "error": None,
+                }
+
+                # A backend without its converter, like wkhtmltopdf or Word, is recorded as an error
+                requests_before = image_server.requests
+                try:
+                    result.update(run_catalogue(file_path, backend, workers, options))
+                except Exception as e:
+                    result["error"] = type(e).__name__ + ": " + str(e)
+                result["image_requests"] = image_server.requests - requests_before
+
+                if result["error"] is not None:
+                    print(f"{rows:>8}  {backend:>8}  failed: {result['error']}")
+                else:
+                    baseline = load_baseline(compare_file, result)
+                    ratio = f"{result['wall_seconds'] / baseline['wall_seconds']:.2f}x" if baseline else "-"
+                    print(
+                        f"{rows:>8}  {backend:>8}  {result['read_seconds']:>8.2f}  {result['extract_seconds']:>9.2f}  "
+                        f"{result['render_seconds']:>9.2f}  {result['wall_seconds']:>8.2f}  "
+                        f"{result['rows_per_second']:>8.0f}  {result['output_bytes'] / 1024 / 1024:>8.1f}  {ratio:>8}"
+                    )
+
+                if results_file:
+                    with open(results_file, "a", encoding="utf-8") as file:
+                        file.write(json.dumps(result) + "\n")
+
+
+# Latency percentiles in milliseconds of a list of seconds
+def latency_ms(seconds):
+    seconds = sorted(seconds)
+
+    return {
+        "p50": seconds[len(seconds) // 2] * 1000,
+        "p95": seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))] * 1000,
+        "max": seconds[-1] * 1000,
+    }
+
+
+# Compare the latency of creating the pdf files of a single product with a new run of the command line,
+# which starts python, reads the file and extracts the characteristics every time, and with the render service,
+# which keeps them loaded: forced to create the pdf files while the images are downloaded, forced again with
+# the images cached, and with the pdf files reused
+def benchmark_service(rows, backend, documents, attributes, variants, sparsity, seed, file_format, image_size,
+                      workers, options):
+    with ImageServer(image_size) as image_server, tempfile.TemporaryDirectory() as work_dir:
+        file_path = os.path.join(work_dir, "catalogue." + file_format)
+        generate_catalogue(file_path, rows, attributes, variants, sparsity, image_server.url, seed)
+        products = ["P" + str(i).zfill(7) for i in range(rows // variants)]
+        random.Random(seed).shuffle(products)
+
+        cwd = os.getcwd()
+        os.chdir(work_dir)
+        try:
+            # A new run of the command line for a few products, the first run builds the index and the input cache
+            command = [sys.executable, "-m", "csv_xlsx_to_pdf", file_path, "--backend", backend, "--workers",
+                       str(workers), "--converter", options["converter"], "--image-dpi", str(options["image_dpi"]),
+                       "--force", "--only"]
+            env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__)))
+            subprocess.run(command + [products[0]], capture_output=True, check=True, env=env)
+            one_shot = []
+            for product in products[1 : 1 + min(3, documents)]:
+                start = time.perf_counter()
+                subprocess.run(command + [product], capture_output=True, check=True, env=env)
+                one_shot.append(time.perf_counter() - start)
+
+            # The same products rendered by the render service over its HTTP API
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                service = RenderService(file_path, backend=backend, workers=workers, **options)
+            server = create_server(service, 0)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            try:
+                def render(product, force):
+                    request = urllib.request.Request(
+                        "http://127.0.0.1:" + str(server.server_address[1]) + "/render", method="POST",
+                        data=json.dumps({"tokens": [product], "force": force}).encode("utf-8"),
+                    )
+                    start = time.perf_counter()
+                    with urllib.request.urlopen(request) as response:
+                        response.read()
+                    return time.perf_counter() - start
+
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    render(products[0], True)
+                    downloaded = [render(product, True) for product in products[:documents]]
+                    forced = [render(product, True) for product in products[:documents]]
+                    reused = [render(product, False) for product in products[:documents]]
+            finally:
+                server.shutdown()
+                server.server_close()
+                service.close()
+        finally:
+            os.chdir(cwd)
+
+    print(f"{'single product':>24}  {'p50 ms':>8}  {'p95 ms':>8}  {'max ms':>8}")
+    for label, seconds in [
+        ("command line --only", one_shot), ("service, new images", downloaded), ("service", forced),
+        ("service, reused", reused),
+    ]:
+        latency = latency_ms(seconds)
+        print(f"{label:>24}  {latency['p50']:>8.1f}  {latency['p95']:>8.1f}  {latency['max']:>8.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the per-document latency of a backend, the html generation throughput "
+        "or the cost of reading an xlsx file"
+    )
+    parser.add_argument(
+        "--backend",
+        choices=["html", "docx", "native"],
+        default="html",
+        help="html compares the wkhtmltopdf batch sizes, docx compares per-file and bulk conversion "
+        "with --converter, native measures the documents drawn directly to pdf (default: html)",
+    )
+    parser.add_argument(
+        "--documents",
+        type=int,
+        default=32,
+        help="number of documents rendered for every measure (default: 32)",
+    )
+    parser.add_argument(
+        "--batch-sizes",
+        default="1,2,4,8,16,32",
+        help="comma separated batch sizes to compare with --backend html (default: 1,2,4,8,16,32)",
+    )
+    parser.add_argument(
+        "--converter",
+        choices=sorted(CONVERTERS),
+        default="word",
+        help="program converting the docx files to pdf with --backend docx (default: word)",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of processes drawing the documents with --backend native (default: number of CPUs)",
+    )
+    parser.add_argument(
+        "--xlsx",
+        help="compare the load time and peak memory of the xlsx readers on this file instead",
+    )
+    parser.add_argument(
+        "--html",
+        action="store_true",
+        help="measure the html generation throughput of --documents documents instead",
+    )
+
+    suite = parser.add_argument_group("synthetic catalogue suite")
+    suite.add_argument(
+        "--suite",
+        action="store_true",
+        help="convert synthetic catalogues of every --rows size with every --backends backend instead, "
+        "the images are served by a local server",
+    )
+    suite.add_argument(
+        "--rows",
+        default="1000,10000",
+        help="comma separated numbers of rows of the catalogues (default: 1000,10000)",
+    )
+    suite.add_argument(
+        "--attributes",
+        type=int,
+        default=40,
+        help="number of Attribute_ columns, the first half are characteristics (default: 40)",
+    )
+    suite.add_argument(
+        "--variants",
+        type=int,
+        default=3,
+        help="number of rows of every ProductPrimaryToken (default: 3)",
+    )
+    suite.add_argument(
+        "--sparsity",
+        type=float,
+        default=0.5,
+        help="fraction of empty attribute values (default: 0.5)",
+    )
+    suite.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="seed of the generated values, the same seed gives the same catalogue (default: 0)",
+    )
+    suite.add_argument(
+        "--format",
+        choices=["csv", "xlsx"],
+        default="csv",
+        help="file format of the catalogues (default: csv)",
+    )
+    suite.add_argument(
+        "--image-size",
+        type=int,
+        default=2000,
+        help="width and height in pixels of the jpeg photo served for every image url, "
+        "0 serves the image-not-found picture (default: 2000)",
+    )
+    suite.add_argument(
+        "--image-dpi",
+        type=int,
+        default=150,
+        help="resolution of the normalized images of the run, 0 uses the original images (default: 150)",
+    )
+    suite.add_argument(
+        "--backends",
+        default="html,docx,native",
+        help="comma separated backends converting the catalogues (default: html,docx,native)",
+    )
+    suite.add_argument(
+        "--results",
+        default="benchmark_results.jsonl",
+        help="file where a JSON line is appended for every catalogue and backend (default: benchmark_results.jsonl)",
+    )
+    suite.add_argument(
+        "--compare",
+        metavar="FILE",
+        help="results file of a previous run, the wall time is compared with its last result "
+        "of the same catalogue and backend",
+    )
+    suite.add_argument(
+        "--service",
+        action="store_true",
+        help="compare the latency of a single product with the command line and with the render service "
+        "on a catalogue of the first --rows size, rendering --documents products with --backend",
+    )
+    args = parser.parse_args()
+
+    if args.service:
+        benchmark_service(
+            int(args.rows.split(",")[0]),
+            args.backend,
+            max(1, args.documents),
+            args.attributes,
+            max(1, args.variants),
+            args.sparsity,
+            args.seed,
+            args.format,
+            args.image_size,
+            max(1, args.workers),
+            {"converter": args.converter, "image_dpi": args.image_dpi},
+        )
+    elif args.suite:
+        benchmark_suite(
+            [int(rows) for rows in args.rows.split(",")],
+            args.backends.split(","),
+            args.attributes,
+            max(1, args.variants),
+            args.sparsity,
+            args.seed,
+            args.format,
+            args.image_size,
+            max(1, args.workers),
+            {"converter": args.converter, "image_dpi": args.image_dpi},
+            args.results,
+            args.compare,
+        )
+    elif args.xlsx:
+        benchmark_xlsx(args.xlsx)
+    elif args.html:
+        benchmark_html(args.documents)
+    elif args.backend == "docx":
+        benchmark_docx(args.documents, args.converter)
+    elif args.backend == "native":
+        benchmark_native(args.documents, max(1, args.workers))
+    else:
+        benchmark_html_batches(args.documents, [int(size) for size in args.batch_sizes.split(",")])
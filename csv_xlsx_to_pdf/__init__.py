@@ -0,0 +1,28 @@
+# Convert csv and xlsx files to formatted pdf files, with the convert function or the command line
+import importlib
+
+
+# Module of every name of the package, imported when the name is first used so that
+# importing the package, or starting the command line, does not load pandas and the renderers
+EXPORTS = {
+    "DEFAULT_BACKEND": "renderers",
+    "RENDERERS": "renderers",
+    "RenderService": "service",
+    "Renderer": "renderers",
+    "load_renderer": "renderers",
+    "convert": "pipeline",
+    "iter_outputs": "core",
+    "iter_rows": "core",
+    "read_only_rows": "index",
+    "read_rows": "core",
+}
+
+
+def __getattr__(name):
+    if name not in EXPORTS:
+        raise AttributeError("module " + __name__ + " has no attribute " + name)
+
+    return getattr(importlib.import_module("." + EXPORTS[name], __name__), name)
+
+
+__all__ = sorted(EXPORTS)
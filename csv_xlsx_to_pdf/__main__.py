@@ -0,0 +1,6 @@
+# Run the command line with python -m csv_xlsx_to_pdf
+from .cli import main
+
+
+if __name__ == "__main__":
+    main()
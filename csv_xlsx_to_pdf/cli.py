@@ -0,0 +1,294 @@
+# Importing libraries
+import argparse
+
+from .metrics import Metrics
+from .renderers import DEFAULT_BACKEND, RENDERERS
+from .renderers.converters import CONVERTERS
+from .startup import ImportProfiler
+
+
+# Parse a --shard value i/N, the shards are numbered from 1 to N
+def parse_shard(value):
+    index, _, count = value.partition("/")
+    try:
+        shard = int(index), int(count)
+    except ValueError:
+        raise argparse.ArgumentTypeError("use i/N, like 1/4")
+    if not 1 <= shard[0] <= shard[1]:
+        raise argparse.ArgumentTypeError("the shard must be between 1/N and N/N")
+
+    return shard
+
+
+# Parse the command line and convert the file, backend is the backend used when --backend is not given
+def main(argv=None, backend=DEFAULT_BACKEND):
+    parser = argparse.ArgumentParser(description="Convert a csv or xlsx file to pdf files")
+    parser.add_argument("file_path", nargs="?", help="path of the csv or xlsx file")
+    parser.add_argument(
+        "--backend",
+        choices=sorted(RENDERERS),
+        default=backend,
+        help="html renders html files with wkhtmltopdf, docx builds word documents and converts them "
+        "with --converter, native draws the pdf files directly (default: " + backend + ")",
+    )
+    parser.add_argument(
+        "--workers",
+        "--build-workers",
+        dest="workers",
+        type=int,
+        help="number of pdf files rendered in parallel, threads running wkhtmltopdf for html and "
+        "processes building the documents for docx and native (default: 1 for html, number of CPUs otherwise)",
+    )
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="read a csv file in chunks and process one ProductPrimaryToken at a time",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=50000,
+        help="number of csv rows read at a time with --stream (default: 50000)",
+    )
+    parser.add_argument(
+        "--sorted",
+        action="store_true",
+        help="the rows of a ProductPrimaryToken are consecutive in the csv file, skip spilling it to disk",
+    )
+    parser.add_argument(
+        "--only",
+        metavar="TOKEN[,TOKEN...]",
+        type=lambda value: value.split(","),
+        help="create only the pdf files of these ProductPrimaryTokens or Tokens, a csv file is read with an index "
+        "built by the first run and kept next to the file",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="i/N",
+        type=parse_shard,
+        help="create only the pdf files of the ProductPrimaryTokens of the shard i of N, split by a stable hash, "
+        "with the manifest of the shard in PDF/shards, to split a file across machines",
+    )
+    parser.add_argument(
+        "--merge-shards",
+        action="store_true",
+        help="check that every pdf file of the file was created by exactly one shard and merge the manifests "
+        "of the shards into PDF/manifest.json, after the PDF folders of the shards are copied together",
+    )
+    parser.add_argument(
+        "--input-cache",
+        default="input_cache",
+        metavar="DIR",
+        help="folder where the parsed file is kept, the next runs load it instead of parsing the file again "
+        "while the file does not change, not used with --stream (default: input_cache)",
+    )
+    parser.add_argument(
+        "--no-input-cache",
+        dest="input_cache",
+        action="store_const",
+        const=None,
+        help="parse the file again without using or filling the input cache",
+    )
+    parser.add_argument(
+        "--combine",
+        choices=["token", "file"],
+        help="create one pdf file for every ProductPrimaryToken or one pdf file for the whole file, "
+        "with a bookmark for every product, instead of one pdf file for every row",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="create every pdf file again, even if the row did not change since the last run",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="print the time spent importing every library used by the run at the end of the run",
+    )
+    parser.add_argument(
+        "--metrics",
+        dest="metrics_file",
+        metavar="FILE",
+        help="write a JSON summary of the run to this file at the end of the run: wall time, throughput, "
+        "counts and the p50/p95/p99 latency of every stage, '-' prints it",
+    )
+    parser.add_argument(
+        "--metrics-rows",
+        dest="metrics_rows",
+        metavar="FILE",
+        help="write a JSON line with the pdf file and the stage timings of every row to this file",
+    )
+
+    html = parser.add_argument_group("html backend")
+    html.add_argument(
+        "--batch-size",
+        type=int,
+        default=1,
+        help="number of rows rendered by a single wkhtmltopdf call (default: 1)",
+    )
+    html.add_argument(
+        "--dump-html",
+        dest="dump_dir",
+        metavar="DIR",
+        help="also write the html content of every row to an html file in this folder, for debugging",
+    )
+
+    documents = parser.add_argument_group("docx and native backends")
+    documents.add_argument(
+        "--queue-size",
+        type=int,
+        help="maximum documents waiting for conversion (default: twice the workers)",
+    )
+    documents.add_argument(
+        "--converter",
+        choices=sorted(CONVERTERS),
+        default="word",
+        help="program converting the docx files to pdf (default: word)",
+    )
+    documents.add_argument(
+        "--bulk",
+        action="store_true",
+        help="convert all the docx files in a single pass at the end of the run",
+    )
+
+    images = parser.add_argument_group("images")
+    images.add_argument(
+        "--image-dpi",
+        type=int,
+        default=150,
+        help="resolution of the images in the documents, every image is downscaled and recompressed once "
+        "and kept in the image cache, 0 uses the original images (default: 150)",
+    )
+    images.add_argument(
+        "--image-quality",
+        type=int,
+        default=85,
+        help="jpeg quality of the downscaled images (default: 85)",
+    )
+    images.add_argument(
+        "--image-cache",
+        default="image_cache",
+        help="folder of the downloaded images (default: image_cache)",
+    )
+    images.add_argument(
+        "--image-cache-size",
+        type=int,
+        default=500,
+        help="maximum size of the image cache in MB (default: 500)",
+    )
+    images.add_argument(
+        "--image-max-age",
+        type=float,
+        default=24,
+        help="hours before a cached image is revalidated (default: 24)",
+    )
+    images.add_argument(
+        "--download-workers",
+        type=int,
+        default=8,
+        help="number of images downloaded in parallel (default: 8)",
+    )
+    images.add_argument(
+        "--per-host",
+        type=int,
+        default=4,
+        help="maximum parallel downloads from the same host (default: 4)",
+    )
+    images.add_argument(
+        "--timeout",
+        type=float,
+        default=30,
+        help="seconds before an image download is abandoned (default: 30)",
+    )
+
+    service = parser.add_argument_group("render service")
+    service.add_argument(
+        "--serve",
+        action="store_true",
+        help="load the file once and serve a local HTTP API creating the pdf files of products on demand, "
+        "the file is loaded again when it changes",
+    )
+    service.add_argument(
+        "--port",
+        type=int,
+        default=8765,
+        help="local port of the render service (default: 8765)",
+    )
+    service.add_argument(
+        "--socket",
+        dest="socket_path",
+        metavar="PATH",
+        help="serve the render service on this Unix socket instead of a port",
+    )
+    args = parser.parse_args(argv)
+
+    # Check if the file path is provided as an argument
+    if not args.file_path:
+        print("Please provide the file path as an argument.")
+        return
+
+    # The catalogue of the whole file cannot be created from a few products
+    if args.only and args.combine == "file":
+        parser.error("--only cannot be used with --combine file")
+
+    # A shard creates the pdf files of its products, not of the products given
+    if args.only and args.shard is not None:
+        parser.error("--only and --shard cannot be used together")
+
+    # Time the libraries imported by the run, they are only imported by the code that uses them
+    options = vars(args)
+    profiler = None
+    if options.pop("profile_startup"):
+        profiler = ImportProfiler()
+        profiler.start()
+
+    # Time the stages of the run only when a metrics file is given
+    metrics_file = options.pop("metrics_file")
+    metrics_rows = options.pop("metrics_rows")
+    metrics = Metrics(metrics_rows) if metrics_file or metrics_rows else None
+
+    try:
+        # Check and merge the manifests of the shards
+        if options.pop("merge_shards"):
+            from .shards import merge_shards
+
+            problems = merge_shards(options["file_path"], options["input_cache"])
+            for problem in problems:
+                print(problem)
+            if problems:
+                parser.exit(1, "The shards cannot be merged, " + str(len(problems)) + " problems found\n")
+            return
+
+        # Serve the render service until the program is interrupted
+        if options.pop("serve"):
+            if options.pop("shard") is not None:
+                parser.error("--shard cannot be used with --serve")
+
+            # The service loads the whole file and every job gives its tokens and force
+            for option in ("only", "stream", "sorted", "force"):
+                if options.pop(option):
+                    parser.error("--" + option + " cannot be used with --serve")
+            if options.pop("chunk_size") != parser.get_default("chunk_size"):
+                parser.error("--chunk-size cannot be used with --serve")
+            from .service import serve
+
+            serve(options.pop("file_path"), **options)
+            return
+
+        options.pop("port")
+        options.pop("socket_path")
+        from .pipeline import convert
+
+        convert(options.pop("file_path"), presorted=options.pop("sorted"), metrics=metrics, **options)
+
+        if metrics_file:
+            metrics.write_summary(metrics_file)
+    except KeyboardInterrupt:
+        # The temporary files are removed when the renderer is closed
+        print("Program interrupted. Cleaning up...")
+    finally:
+        if metrics is not None:
+            metrics.close()
+        if profiler is not None:
+            profiler.stop()
+            profiler.report()
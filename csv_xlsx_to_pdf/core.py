@@ -0,0 +1,377 @@
+# Importing libraries
+import csv
+import os
+import pickle
+import tempfile
+import zlib
+from itertools import groupby
+
+import numpy as np
+import pandas as pd
+
+from .input_cache import cache_path, load_frame, save_frame
+from .metrics import NoMetrics
+from .shards import select_shard
+
+
+# Detect the delimiter of the csv file
+def detect_csv_delimiter(file_path):
+    with open(file_path, "r", newline="", encoding="utf-8", errors="ignore") as file:
+        sample = file.read(4096)  # Read a sample of the file
+
+        dialect = csv.Sniffer().sniff(sample)
+        delimiter = dialect.delimiter
+
+    return delimiter
+
+
+# Read the csv file
+def read_csv(file, delimiter):
+    df = pd.read_csv(file, delimiter=delimiter, encoding="utf-8")
+
+    return df
+
+
+# Read the first sheet of the xlsx file row by row without loading the whole workbook in memory
+def read_xlsx(file):
+    # openpyxl is only imported for xlsx files
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file, read_only=True, data_only=True)
+    try:
+        rows = wb[wb.sheetnames[0]].iter_rows(values_only=True)
+        header = next(rows)
+        df = pd.DataFrame.from_records(rows, columns=header)
+    finally:
+        wb.close()
+
+    # Give numeric columns a numeric dtype and empty cells a NaN value, like pd.read_csv does
+    df = df.infer_objects().fillna(value=np.nan)
+
+    # Numeric identifiers are used as text in the pdf file names
+    for column in ["Token", "ProductPrimaryToken", "Name_es"]:
+        df[column] = df[column].map(lambda value: value if pd.isna(value) else str(value))
+
+    return df
+
+
+# Read the csv file in chunks to find the columns to drop and a dtype for every column that is the same in all chunks
+def scan_csv(file_path, delimiter, chunk_size):
+    kinds = {}
+    all_nan = None
+    all_zero = None
+
+    for chunk in pd.read_csv(file_path, delimiter=delimiter, encoding="utf-8", chunksize=chunk_size):
+        for column in chunk.columns:
+            kinds.setdefault(column, set()).add(chunk[column].dtype.kind)
+
+        all_nan = chunk.isna().all() if all_nan is None else all_nan & chunk.isna().all()
+        all_zero = chunk.eq(0.0).all() if all_zero is None else all_zero & chunk.eq(0.0).all()
+
+    # Use the dtype pandas would infer when reading the whole file at once
+    dtypes = {}
+    for column, column_kinds in kinds.items():
+        if column_kinds <= {"i"}:
+            dtypes[column] = "int64"
+        elif column_kinds <= {"i", "f"}:
+            dtypes[column] = "float64"
+        elif column_kinds <= {"b"}:
+            dtypes[column] = "bool"
+        else:
+            dtypes[column] = "object"
+
+    # Drop columns with all NaN values and columns with all 0 values
+    drop_columns = [column for column in kinds if all_nan[column] or all_zero[column]]
+
+    return dtypes, drop_columns
+
+
+# Yield blocks of complete ProductPrimaryToken groups from chunks of a csv file where the rows of a token are consecutive
+def iter_sorted_blocks(chunks):
+    seen_tokens = set()
+    carry = None
+
+    for chunk in chunks:
+        if carry is not None:
+            chunk = pd.concat([carry, chunk])
+
+        # The rows of the last token may continue in the next chunk
+        tokens = chunk["ProductPrimaryToken"]
+        is_last_token = tokens == tokens.iloc[-1]
+        carry = chunk[is_last_token]
+        block = chunk[~is_last_token]
+
+        # Every run of consecutive rows with the same token must be a token that was not seen before
+        run_tokens = block["ProductPrimaryToken"][
+            block["ProductPrimaryToken"] != block["ProductPrimaryToken"].shift()
+        ]
+        if run_tokens.duplicated().any() or seen_tokens.intersection(run_tokens):
+            raise ValueError(
+                "The rows of a ProductPrimaryToken are not consecutive, run it without --sorted"
+            )
+        seen_tokens.update(run_tokens)
+
+        if len(block) > 0:
+            yield block
+
+    if carry is not None and len(carry) > 0:
+        if carry["ProductPrimaryToken"].iloc[0] in seen_tokens:
+            raise ValueError(
+                "The rows of a ProductPrimaryToken are not consecutive, run it without --sorted"
+            )
+        yield carry
+
+
+# Yield blocks of complete ProductPrimaryToken groups by spilling the chunks to bucket files on disk
+def iter_spilled_blocks(chunks, temp_dir, num_buckets):
+    bucket_files = [open(os.path.join(temp_dir, str(i) + ".pkl"), "wb") for i in range(num_buckets)]
+
+    # Write the rows of every chunk to the bucket of their ProductPrimaryToken
+    try:
+        for chunk in chunks:
+            buckets = chunk["ProductPrimaryToken"].map(
+                lambda token: zlib.crc32(str(token).encode("utf-8")) % num_buckets
+            )
+            for bucket, rows in chunk.groupby(buckets, sort=False):
+                pickle.dump(rows, bucket_files[bucket])
+    finally:
+        for file in bucket_files:
+            file.close()
+
+    # Read the buckets one by one and yield their rows sorted by ProductPrimaryToken
+    for i in range(num_buckets):
+        parts = []
+        with open(os.path.join(temp_dir, str(i) + ".pkl"), "rb") as file:
+            while True:
+                try:
+                    parts.append(pickle.load(file))
+                except EOFError:
+                    break
+
+        if not parts:
+            continue
+
+        yield pd.concat(parts).sort_values(by="ProductPrimaryToken", kind="stable")
+
+
+# Read the csv file in chunks and yield blocks of rows where all the rows of a ProductPrimaryToken are in the same block,
+# with a shard only the rows of the shard are kept, before they are spilled to disk
+def iter_csv_blocks(file_path, delimiter, chunk_size, presorted, shard=None):
+    dtypes, drop_columns = scan_csv(file_path, delimiter, chunk_size)
+
+    # Drop the empty columns and the rows with all NaN values
+    chunks = (
+        chunk.drop(columns=drop_columns).dropna(axis=0, how="all")
+        for chunk in pd.read_csv(
+            file_path, delimiter=delimiter, encoding="utf-8", dtype=dtypes, chunksize=chunk_size
+        )
+    )
+    if shard is not None:
+        chunks = (select_shard(chunk, shard) for chunk in chunks)
+    chunks = (chunk for chunk in chunks if len(chunk) > 0)
+
+    if presorted:
+        yield from iter_sorted_blocks(chunks)
+    else:
+        # Use roughly one bucket per 16 MB of csv so every bucket fits in memory
+        num_buckets = os.path.getsize(file_path) // (16 * 1024 * 1024) + 1
+        with tempfile.TemporaryDirectory() as temp_dir:
+            yield from iter_spilled_blocks(chunks, temp_dir, num_buckets)
+
+
+# Extract Characteristics from the csv file
+def extract_characteristics(att_col, primary_tokens):
+    # Group the rows by ProductPrimaryToken once instead of filtering the whole DataFrame per token
+    grouped = att_col.groupby("ProductPrimaryToken", sort=False)
+
+    # Number of unique values of every column for every ProductPrimaryToken (excludes the "ProductPrimaryToken" column)
+    num_unique_values = grouped.nunique()
+
+    # First value of every column for every ProductPrimaryToken
+    first_values = grouped.head(1).set_index("ProductPrimaryToken")
+    first_values = first_values.loc[num_unique_values.index, num_unique_values.columns]
+
+    # Create a dictionary with the characteristics of every ProductPrimaryToken found in the DataFrame
+    grouped_characteristics = {}
+
+    columns = num_unique_values.columns
+    is_characteristic = num_unique_values.eq(1).to_numpy()
+    values = first_values.to_numpy(dtype=object)
+
+    for primary_token, row_mask, row_values in zip(num_unique_values.index, is_characteristic, values):
+        characteristics = {}
+
+        for column, keep, value in zip(columns, row_mask, row_values):
+            if keep and pd.notna(value) and value != "" and value != "None":
+                characteristics[column] = value
+
+        grouped_characteristics[primary_token] = characteristics
+
+    # Create a dictionary for the characteristics of all tokens
+    all_characteristics = {}
+
+    for primary_token in primary_tokens:
+        all_characteristics[primary_token] = grouped_characteristics.get(primary_token, {})
+
+    return all_characteristics
+
+
+# Drop the empty columns and rows of the DataFrame and number its rows from 0 in their current order
+def clean_rows(df):
+    # Drop columns with all NaN values and columns with all 0 values
+    df = df.dropna(axis=1, how="all").drop(columns=df.columns[df.eq(0.0).all()])
+
+    # Drop rows with all NaN values
+    df = df.dropna(axis=0, how="all")
+
+    # Reset the index, the rows are looked up by position
+    return df.reset_index(drop=True)
+
+
+# Yield the data of every row of the DataFrame with its characteristics and attributes
+def iter_rows(df):
+    # Get columns 2, 3, and 4
+    columns = df.iloc[:, [1, 2, 3, 4, 6, 8]]
+
+    # Select columns that start with "Attribute_" (excluding "Attribute_BulletPointsProducto" and "Attribute_Estado")
+    attribute_columns = df.filter(
+        regex="^(?!Attribute_BulletPointsProducto|Attribute_Estado)(Attribute_)"
+    ).copy()  # Create a copy of the filtered DataFrame
+
+    # Add the ProductPrimaryToken column to the attribute_columns DataFrame
+    attribute_columns["ProductPrimaryToken"] = df["ProductPrimaryToken"]
+
+    # Get duplicate attribute columns based on ProductPrimaryToken
+    duplicate_attribute_columns = attribute_columns[
+        attribute_columns.duplicated(subset="ProductPrimaryToken", keep=False)
+    ]
+
+    # Get the unique tokens
+    unique_tokens = columns["ProductPrimaryToken"].unique()
+
+    # Extract the characteristics of every ProductPrimaryToken
+    chars = extract_characteristics(duplicate_attribute_columns, unique_tokens)
+
+    # Values of the attribute columns of every row and the mask of the values that are not empty
+    attribute_names = attribute_columns.columns.drop("ProductPrimaryToken")
+    attribute_values = attribute_columns[attribute_names].to_numpy(dtype=object)
+    non_empty = (
+        attribute_columns[attribute_names].notna().to_numpy()
+        & (attribute_values != "") & (attribute_values != "None")
+    )
+
+    # Mask of the characteristic columns of every ProductPrimaryToken
+    characteristic_masks = {
+        primary_token: attribute_names.isin(list(characteristics))
+        for primary_token, characteristics in chars.items()
+    }
+
+    for i in range(len(columns["ProductPrimaryToken"])):
+        char = chars[
+            columns["ProductPrimaryToken"][i]
+        ]  # Get the characteristics of the row
+
+        # Get the attributes of the row, the non empty values that are not characteristics
+        keep = non_empty[i] & ~characteristic_masks[columns["ProductPrimaryToken"][i]]
+        attr = {
+            attribute_names[j]: attribute_values[i, j] for j in np.flatnonzero(keep)
+        }
+
+        # Create a dictionary with the data of the row
+        yield {
+            "Token": columns["Token"][i],
+            "ProductPrimaryToken": columns["ProductPrimaryToken"][i],
+            "Name_es": columns["Name_es"][i],
+            "ProductSection_T2_INFO_es": columns["ProductSection_T2_INFO_es"][i],
+            "Image_ProductPrimary": columns["Image_ProductPrimary"][i],
+            "Attribute_BulletPointsProducto": columns["Attribute_BulletPointsProducto"][i],
+            "Characteristics": char,
+            "Attributes": attr,
+        }
+
+
+# Read the whole csv or xlsx file into a DataFrame sorted by ProductPrimaryToken without the empty columns and rows.
+# The DataFrame is kept in the input_cache folder and reused while the file does not change
+def read_frame(file_path, input_cache=None):
+    _, file_extension = os.path.splitext(file_path)
+
+    # Load the DataFrame parsed by a previous run if the file did not change
+    if input_cache:
+        cached_file = cache_path(input_cache, file_path)
+        df = load_frame(cached_file)
+        if df is not None:
+            print("Reading " + file_path + " from the input cache...")
+            return df
+
+    # Read the csv or xlsx file
+    print("Reading " + file_path + "...")
+    if file_extension == ".csv":
+        df = read_csv(file_path, detect_csv_delimiter(file_path))
+    else:
+        df = read_xlsx(file_path)
+
+    df = clean_rows(df.sort_values(by="ProductPrimaryToken"))
+
+    if input_cache:
+        save_frame(df, cached_file)
+
+    return df
+
+
+# Raise an error if the file is not a csv or xlsx file
+def check_file_type(file_path):
+    _, file_extension = os.path.splitext(file_path)
+    if file_extension not in (".csv", ".xlsx"):
+        raise ValueError("Unsupported file type " + file_extension + ", use a csv or xlsx file")
+
+
+# Read the csv or xlsx file and yield the data of every row, the rows of a ProductPrimaryToken are consecutive.
+# prefetch is called with every block of rows before its rows are yielded, like the whole DataFrame.
+# Without stream the parsed DataFrame is kept in the input_cache folder and reused while the file does not change.
+# shard is (i, N) to yield only the rows of the ProductPrimaryTokens of the shard i of N, see shard_of
+def read_rows(file_path, stream=False, chunk_size=50000, presorted=False, prefetch=None, metrics=NoMetrics(),
+              input_cache=None, shard=None):
+    # Check the file type and get the file extension
+    check_file_type(file_path)
+    _, file_extension = os.path.splitext(file_path)
+
+    # Read the csv file in chunks and process one ProductPrimaryToken at a time
+    if stream and file_extension == ".csv":
+        print("Streaming " + file_path + "...")
+        blocks = iter_csv_blocks(file_path, detect_csv_delimiter(file_path), chunk_size, presorted, shard)
+        for block in metrics.timed_iter(blocks, "read"):
+            block = block.reset_index(drop=True)
+            if prefetch is not None:
+                prefetch(block)
+            yield from metrics.timed_iter(iter_rows(block), "extract")
+        return
+
+    # Read the csv or xlsx file, or the DataFrame parsed by a previous run
+    with metrics.timer("read"):
+        df = read_frame(file_path, input_cache)
+
+    # Keep only the ProductPrimaryTokens of the shard
+    if shard is not None:
+        df = select_shard(df, shard)
+        print("Shard " + str(shard[0]) + "/" + str(shard[1]) + " has " + str(len(df)) + " rows")
+        if len(df) == 0:
+            return
+
+    if prefetch is not None:
+        prefetch(df)
+
+    print("Extracting characteristics for every PrimaryProductToken...")
+    yield from metrics.timed_iter(iter_rows(df), "extract")
+
+
+# Group the rows by pdf file: one pdf file for every row, for every ProductPrimaryToken
+# or for the whole file, the rows of a ProductPrimaryToken are consecutive
+def iter_outputs(rows, combine, name):
+    if combine == "file":
+        yield name + ".pdf", list(rows)
+    elif combine == "token":
+        for primary_token, group in groupby(rows, key=lambda data: data["ProductPrimaryToken"]):
+            yield primary_token + ".pdf", list(group)
+    else:
+        for data in rows:
+            yield data["ProductPrimaryToken"] + "_" + data["Token"] + ".pdf", [data]
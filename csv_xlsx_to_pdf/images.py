@@ -0,0 +1,452 @@
+# Importing libraries
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from urllib.parse import urlparse
+
+from .metrics import NoMetrics
+
+
+# Placeholder drawn for the rows without an image
+IMAGE_NOT_FOUND = os.path.join(os.path.dirname(os.path.abspath(__file__)), "image-not-found.png")
+
+# Width of the image in the documents in inches
+DISPLAY_WIDTH = 3.61
+
+
+# Downscale an image to the display width at the given dpi and recompress it, photos as jpeg and
+# images with transparency or few colors as png. The original content is returned if it cannot be decoded
+# or if it is already smaller than the normalized image
+def normalize_image(content, width, dpi, quality):
+    # Pillow is only imported when the images are normalized
+    from PIL import Image, ImageOps
+
+    max_width = max(1, round(width * dpi))
+
+    try:
+        with Image.open(BytesIO(content)) as original:
+            # Decode a jpeg image directly at a reduced scale when it is much larger than needed
+            if original.format == "JPEG":
+                original.draft("RGB", (max_width, max_width))
+
+            image = ImageOps.exif_transpose(original)
+            resized = image.width > max_width
+            if resized:
+                height = max(1, round(image.height * max_width / image.width))
+                image = image.resize((max_width, height), Image.LANCZOS)
+
+            output = BytesIO()
+            if "A" in image.mode or "transparency" in image.info:
+                image.convert("RGBA").save(output, "PNG", optimize=True)
+            elif image.mode in ("1", "L", "P"):
+                image.save(output, "PNG", optimize=True)
+            else:
+                image.convert("RGB").save(output, "JPEG", quality=quality, optimize=True)
+    except (OSError, ValueError, Image.DecompressionBombError) as e:
+        print("Error while normalizing an image:", str(e))
+        return content
+
+    if not resized and output.tell() >= len(content):
+        return content
+
+    return output.getvalue()
+
+
+# Cache of the downloaded images, kept on disk between runs and in memory during a run.
+# With a dpi, every image is normalized once for the display width and the normalized image
+# is kept on disk next to the original, the documents only get the normalized images
+class ImageCache:
+    def __init__(self, directory="image_cache", max_size=500 * 1024 * 1024, max_age=24 * 3600, memory_items=128,
+                 workers=8, per_host=4, timeout=30, dpi=0, quality=85, width=DISPLAY_WIDTH, metrics=None):
+        self.directory = directory
+        self.max_size = max_size  # Maximum size of the images on disk in bytes
+        self.max_age = max_age  # Seconds before an image on disk is revalidated with the server
+        self.memory_items = memory_items  # Maximum number of images kept in memory
+        self.per_host = per_host  # Maximum number of downloads running at the same time for every host
+        self.timeout = timeout  # Seconds before a download is abandoned
+        self.dpi = dpi  # Resolution of the normalized images, 0 keeps the original images
+        self.quality = quality  # Jpeg quality of the normalized images
+        self.width = width  # Display width of the images in inches
+        self.metrics = metrics if metrics is not None else NoMetrics()  # Records the time of every download
+
+        self.memory = OrderedDict()
+        self.missing = set()
+        self.hits = 0
+        self.misses = 0
+        self.revalidated = 0
+        self.downloaded_bytes = 0
+        self.normalized = 0
+        self.original_bytes = 0
+        self.normalized_bytes = 0
+
+        # Share the connections between all the downloads, the session is created by the first download
+        self.session = None
+        self.pool_size = workers
+
+        # Download the images in the background with a pool of threads, at most ahead images are downloaded
+        # before the documents use them and they are not evicted from the disk until they are used
+        self.executor = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prefetch")
+        self.ahead = max(1, workers) * 4
+        self.queued = deque()
+        self.futures = {}
+        self.pinned = set()
+        self.host_semaphores = {}
+        self.lock = threading.Lock()
+
+        # Load the index of the images stored on disk, from the least to the most recently used
+        os.makedirs(directory, exist_ok=True)
+        if dpi:
+            os.makedirs(os.path.join(directory, "derived"), exist_ok=True)
+        self.index_path = os.path.join(directory, "index.json")
+        self.index = OrderedDict()
+        if os.path.exists(self.index_path):
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as file:
+                    self.index = OrderedDict(sorted(json.load(file).items(), key=lambda item: item[1]["accessed"]))
+            except ValueError:
+                print("Image cache index is corrupted, starting with an empty cache...")
+
+        # Record the normalized images on disk in the index of their image, the normalized images of the images
+        # that are not in the index anymore are removed. The temporary files of the other runs are left alone
+        derived_dir = os.path.join(directory, "derived")
+        if os.path.isdir(derived_dir):
+            for name in os.listdir(derived_dir):
+                key, _, suffix = name.partition("-")
+                if key == "tmp":
+                    continue
+                entry = self.index.get(key)
+                if entry is None:
+                    os.remove(os.path.join(derived_dir, name))
+                elif suffix not in entry.setdefault("derived", {}):
+                    entry["derived"][suffix] = os.path.getsize(os.path.join(derived_dir, name))
+
+        # Size of the images on disk with their normalized images, kept up to date by every change of the index
+        self.total_size = sum(self.entry_size(entry) for entry in self.index.values())
+
+    # Start downloading the images in the background so they are ready when the documents are created,
+    # the urls are given in the order the documents use them
+    def prefetch(self, urls):
+        self.queued.extend(urls)
+        self.prefetch_next()
+
+    # Download the next queued images while fewer than ahead images wait for their documents, so the images
+    # downloaded ahead of the documents never fill the cache and evict each other before they are used
+    def prefetch_next(self):
+        while self.queued and len(self.futures) < self.ahead:
+            url = self.queued.popleft()
+            if url in self.futures or url in self.memory:
+                continue
+
+            with self.lock:
+                self.pinned.add(hashlib.sha256(url.encode("utf-8")).hexdigest())
+            self.futures[url] = self.executor.submit(self.fetch, url)
+
+    # Forget the queued images and the images downloaded ahead that were not used, so they can be evicted
+    # and the next images are prefetched
+    def cancel_prefetch(self):
+        self.queued.clear()
+        for future in self.futures.values():
+            future.cancel()
+        self.futures.clear()
+
+        with self.lock:
+            self.pinned.clear()
+
+    # Return the content of the image at the url, or None if the image is not found. The lookup is counted
+    # in the hits or misses of the cache unless count is False, when the image was already asked for the same row
+    def get(self, url, count=True):
+        # Wait for the image if it is being downloaded in the background, the download counted the lookup
+        future = self.futures.pop(url, None)
+        if future is not None:
+            future.result()
+
+        try:
+            return self.fetch(url, count and future is None)
+        finally:
+            # The image can be evicted once it is used, download the next images
+            if future is not None:
+                with self.lock:
+                    self.pinned.discard(hashlib.sha256(url.encode("utf-8")).hexdigest())
+            self.prefetch_next()
+
+    # Return the content of the image from memory, disk or the server, counted in the hits or misses when count is True
+    def fetch(self, url, count=True):
+        # Look for the image in memory first, a missing image is a miss even if it is not requested again
+        with self.lock:
+            if url in self.missing:
+                self.misses += count
+                return None
+            if url in self.memory:
+                self.memory.move_to_end(url)
+                self.hits += count
+                return self.memory[url]
+
+            key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+            path = os.path.join(self.directory, key)
+            entry = self.index.get(key)
+            if entry is not None:
+                entry["accessed"] = time.time()
+                self.index.move_to_end(key)
+
+        headers = {}
+        if entry is not None and os.path.exists(path):
+            # Use the image on disk without asking the server while it is fresh
+            if time.time() - entry["fetched"] < self.max_age:
+                with self.lock:
+                    self.hits += count
+                return self.remember(url, self.derive(key, path))
+
+            # Ask the server if the image on disk is still valid
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        else:
+            print("Downloading " + url + "...")
+
+        import requests
+
+        try:
+            with self.host_semaphore(url), self.metrics.timer("download"):
+                response = self.get_session().get(url, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            print("Error while downloading " + url + ":", str(e))
+            response = None
+
+        if response is not None and response.status_code == 304:
+            entry["fetched"] = time.time()
+            with self.lock:
+                self.hits += count
+                self.revalidated += 1
+            return self.remember(url, self.derive(key, path))
+
+        # Remember the missing images so they are not requested again during the run
+        if response is None or response.status_code != 200:
+            with self.lock:
+                self.misses += count
+                self.missing.add(url)
+            return None
+
+        content = response.content
+
+        # Store the image on disk and evict the least recently used images if the cache is too big
+        with open(path, "wb") as file:
+            file.write(content)
+
+        with self.lock:
+            self.misses += count
+            self.downloaded_bytes += len(content)
+
+            # The normalized images of the previous content of the image are outdated
+            previous = self.index.pop(key, None)
+            if previous is not None:
+                self.remove_derived(key, previous)
+                self.total_size -= self.entry_size(previous)
+
+            self.index[key] = {
+                "url": url,
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+                "size": len(content),
+                "fetched": time.time(),
+                "accessed": time.time(),
+            }
+            self.total_size += len(content)
+            self.evict()
+
+        return self.remember(url, self.derive(key, path, content))
+
+    # Path of the normalized image of the url, it exists once the image was returned by get
+    def derived_file(self, url):
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+        return self.derived_path(key)
+
+    def derived_path(self, key, suffix=None):
+        return os.path.join(self.directory, "derived", key + "-" + (suffix or self.derived_suffix()))
+
+    # Resolution and quality of the normalized images, the normalized images of every resolution are kept
+    def derived_suffix(self):
+        return str(self.dpi) + "-" + str(self.quality)
+
+    # Return the normalized content of the image stored on disk, content is given when the image was just downloaded
+    def derive(self, key, path, content=None):
+        if not self.dpi:
+            return content if content is not None else self.read(path)
+
+        # Reuse the normalized image of a previous run, unless the image was downloaded again
+        derived_path = self.derived_path(key)
+        if content is None and os.path.exists(derived_path):
+            derived = self.read(derived_path)
+            with self.lock:
+                # The normalized image may have been written by a run with another image cache
+                entry = self.index.get(key)
+                if entry is not None and self.derived_suffix() not in entry.get("derived", {}):
+                    self.record_derived(entry, len(derived))
+            return derived
+
+        if content is None:
+            content = self.read(path)
+
+        with self.metrics.timer("normalize"):
+            derived = normalize_image(content, self.width, self.dpi, self.quality)
+
+        # Write the normalized image under a temporary name first so it is never read half written,
+        # the name does not start with the key so the eviction of the image does not remove it
+        temp_path = os.path.join(
+            os.path.dirname(derived_path), "tmp-" + str(threading.get_ident()) + "-" + os.path.basename(derived_path)
+        )
+        with open(temp_path, "wb") as file:
+            file.write(derived)
+
+        with self.lock:
+            # Count the normalized image in the size of the cache, it is not kept if its image was evicted meanwhile
+            entry = self.index.get(key)
+            if entry is not None:
+                os.replace(temp_path, derived_path)
+                self.record_derived(entry, len(derived))
+                self.evict()
+            else:
+                os.remove(temp_path)
+
+            self.normalized += 1
+            self.original_bytes += len(content)
+            self.normalized_bytes += len(derived)
+
+        return derived
+
+    # Count the size of the normalized image of the current resolution in the entry of its image and in the cache
+    def record_derived(self, entry, size):
+        derived = entry.setdefault("derived", {})
+        self.total_size += size - derived.get(self.derived_suffix(), 0)
+        derived[self.derived_suffix()] = size
+
+    # Remove the normalized images of every resolution of an image from disk
+    def remove_derived(self, key, entry):
+        for suffix in entry.get("derived", {}):
+            derived_path = self.derived_path(key, suffix)
+            if os.path.exists(derived_path):
+                os.remove(derived_path)
+
+    # Return the session shared by all the downloads, requests is only imported when an image is downloaded
+    def get_session(self):
+        import requests
+        import requests.adapters
+
+        with self.lock:
+            if self.session is None:
+                self.session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(pool_connections=self.pool_size, pool_maxsize=self.pool_size)
+                self.session.mount("http://", adapter)
+                self.session.mount("https://", adapter)
+
+            return self.session
+
+    # Return the semaphore limiting the number of downloads running at the same time for the host of the url
+    def host_semaphore(self, url):
+        host = urlparse(url).netloc
+
+        with self.lock:
+            if host not in self.host_semaphores:
+                self.host_semaphores[host] = threading.Semaphore(max(1, self.per_host))
+
+            return self.host_semaphores[host]
+
+    # Keep the image in memory and drop the least recently used image if there are too many
+    def remember(self, url, content):
+        with self.lock:
+            self.memory[url] = content
+            self.memory.move_to_end(url)
+            if len(self.memory) > self.memory_items:
+                self.memory.popitem(last=False)
+
+        return content
+
+    # Read the content of an image stored on disk
+    def read(self, path):
+        with open(path, "rb") as file:
+            return file.read()
+
+    # Size on disk of an image with its normalized images
+    def entry_size(self, entry):
+        return entry["size"] + sum(entry.get("derived", {}).values())
+
+    # Remove the least recently used images and their normalized images from disk until the cache fits in max_size,
+    # the images downloaded ahead of their documents are kept until they are used
+    def evict(self):
+        if self.total_size <= self.max_size:
+            return
+
+        # The index goes from the least to the most recently used image
+        evicted = []
+        size = self.total_size
+        for key, entry in self.index.items():
+            if size <= self.max_size:
+                break
+            if key not in self.pinned:
+                evicted.append(key)
+                size -= self.entry_size(entry)
+
+        for key in evicted:
+            entry = self.index.pop(key)
+            path = os.path.join(self.directory, key)
+            if os.path.exists(path):
+                os.remove(path)
+            self.remove_derived(key, entry)
+            self.total_size -= self.entry_size(entry)
+
+    # Stop the background downloads, save the index of the images stored on disk and print the counters of the run
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        if self.session is not None:
+            self.session.close()
+
+        # The images downloaded but not used are not needed anymore
+        with self.lock:
+            self.pinned.clear()
+            self.evict()
+
+        with open(self.index_path, "w", encoding="utf-8") as file:
+            json.dump(self.index, file)
+
+        self.metrics.count("image_hits", self.hits)
+        self.metrics.count("image_misses", self.misses)
+        self.metrics.count("image_revalidated", self.revalidated)
+        self.metrics.count("downloaded_bytes", self.downloaded_bytes)
+        self.metrics.count("image_normalized", self.normalized)
+        self.metrics.count("image_original_bytes", self.original_bytes)
+        self.metrics.count("image_normalized_bytes", self.normalized_bytes)
+
+        print(
+            "Image cache: " + str(self.hits) + " hits (" + str(self.revalidated) + " revalidated), "
+            + str(self.misses) + " misses, " + str(self.downloaded_bytes) + " bytes downloaded"
+        )
+        if self.normalized:
+            print(
+                "Image normalization: " + str(self.normalized) + " images from "
+                + f"{self.original_bytes / 1024 / 1024:.1f} MB to {self.normalized_bytes / 1024 / 1024:.1f} MB "
+                + f"({(1 - self.normalized_bytes / max(1, self.original_bytes)) * 100:.0f}% smaller)"
+            )
+
+
+# Get the url of the image of a row, the secondary image is only used if there is no primary image
+def select_image_url(image_value):
+    image_urls = str(image_value).split(",")
+
+    if image_urls[0] != "None" and image_urls[0] != "nan":
+        return image_urls[0]
+    if len(image_urls) > 1 and image_urls[1] != "None" and image_urls[1] != "nan":
+        return image_urls[1]
+
+    return None
+
+
+# Start downloading the images of the rows of the DataFrame, they are part of the content hash of every row
+def prefetch_images(df, image_cache):
+    image_urls = [select_image_url(image) for image in df["Image_ProductPrimary"]]
+    image_cache.prefetch(url for url in dict.fromkeys(image_urls) if url is not None)
@@ -0,0 +1,188 @@
+# Importing libraries
+import csv
+import json
+import os
+from io import BytesIO
+
+import pandas as pd
+
+from .core import check_file_type, detect_csv_delimiter, iter_rows, read_frame, scan_csv
+from .metrics import NoMetrics
+
+
+# Version of the index files, change it when their content changes so the older index files are built again
+INDEX_VERSION = 1
+
+
+# Path of the index of a csv file, kept next to the file
+def index_path(file_path):
+    return file_path + ".index.json"
+
+
+# Byte offset and length of every record of the csv file, a record spans several lines when a quoted value has
+# line breaks. The first record is the header, the blank lines are skipped like pd.read_csv does
+def scan_records(file_path, delimiter):
+    records = []
+    line_ends = []
+
+    with open(file_path, "rb") as file:
+        # Decode the lines for the csv reader and remember where every line ends
+        def lines():
+            offset = 0
+            for line in file:
+                offset += len(line)
+                line_ends.append(offset)
+                yield line.decode("utf-8", errors="replace")
+
+        start = 0
+        for record in csv.reader(lines(), delimiter=delimiter):
+            end = line_ends[-1]
+            if record:
+                records.append((start, end - start))
+            start = end
+
+    return records
+
+
+# Build the index of a csv file: the records of every ProductPrimaryToken, the ProductPrimaryToken of every Token,
+# and the dtypes and empty columns of the whole file so a few rows are read exactly like the whole file
+def build_index(file_path, chunk_size=50000):
+    print("Indexing " + file_path + "...")
+    delimiter = detect_csv_delimiter(file_path)
+    dtypes, drop_columns = scan_csv(file_path, delimiter, chunk_size)
+    records = scan_records(file_path, delimiter)
+
+    # Tokens of every row, read with the dtypes of the whole file like the pdf file names
+    tokens = pd.read_csv(
+        file_path, delimiter=delimiter, encoding="utf-8", usecols=["Token", "ProductPrimaryToken"],
+        dtype={"Token": dtypes["Token"], "ProductPrimaryToken": dtypes["ProductPrimaryToken"]},
+    )
+    if len(tokens) != len(records) - 1:
+        raise ValueError("The records of " + file_path + " could not be located, it cannot be indexed")
+
+    groups = {}
+    variants = {}
+    for primary_token, token, record in zip(tokens["ProductPrimaryToken"], tokens["Token"], records[1:]):
+        if pd.isna(primary_token):
+            continue
+        groups.setdefault(str(primary_token), []).append(record)
+        if not pd.isna(token):
+            variants[str(token)] = str(primary_token)
+
+    stat = os.stat(file_path)
+    index = {
+        "version": INDEX_VERSION,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "delimiter": delimiter,
+        "dtypes": dtypes,
+        "drop_columns": drop_columns,
+        "header": records[0],
+        "groups": groups,
+        "variants": variants,
+    }
+
+    # Keep the index next to the file for the next runs, it is only used for this run if the folder is read-only
+    try:
+        with open(index_path(file_path), "w", encoding="utf-8") as file:
+            json.dump(index, file, ensure_ascii=False)
+    except OSError as e:
+        print("Error while saving the index:", str(e))
+
+    return index
+
+
+# Load the index of a csv file, or build it if the file changed since the index was built
+def load_index(file_path):
+    stat = os.stat(file_path)
+
+    if os.path.exists(index_path(file_path)):
+        try:
+            with open(index_path(file_path), "r", encoding="utf-8") as file:
+                index = json.load(file)
+        except ValueError:
+            index = None
+
+        if (
+            index is not None and index.get("version") == INDEX_VERSION
+            and index["size"] == stat.st_size and index["mtime_ns"] == stat.st_mtime_ns
+        ):
+            return index
+
+    return build_index(file_path)
+
+
+# Read the rows of the ProductPrimaryTokens from the csv file with its index, only their records are read
+def read_indexed_frame(file_path, primary_tokens, index):
+    with open(file_path, "rb") as file:
+        parts = []
+        for offset, length in [index["header"]] + [
+            record for primary_token in primary_tokens for record in index["groups"][primary_token]
+        ]:
+            file.seek(offset)
+            part = file.read(length)
+            parts.append(part if part.endswith(b"\n") else part + b"\n")
+
+    # Skip the columns that are empty in the whole file and drop the rows with all NaN values
+    drop_columns = set(index["drop_columns"])
+    dtypes = {column: dtype for column, dtype in index["dtypes"].items() if column not in drop_columns}
+    df = pd.read_csv(
+        BytesIO(b"".join(parts)), delimiter=index["delimiter"], encoding="utf-8", usecols=list(dtypes), dtype=dtypes
+    )
+    df = df[list(dtypes)].dropna(axis=0, how="all")
+
+    return df.sort_values(by="ProductPrimaryToken", kind="stable").reset_index(drop=True)
+
+
+# Find the ProductPrimaryToken of every token, a ProductPrimaryToken or a Token, and return them in order
+# without duplicates with the tokens that were not found
+def find_primary_tokens(tokens, known_tokens, variants):
+    primary_tokens = []
+    not_found = []
+    for token in tokens:
+        primary_token = token if token in known_tokens else variants.get(token)
+        if primary_token is None:
+            not_found.append(token)
+        elif primary_token not in primary_tokens:
+            primary_tokens.append(primary_token)
+
+    return primary_tokens, not_found
+
+
+# Read only the rows of the given ProductPrimaryTokens and Tokens and yield their data like read_rows.
+# The characteristics are extracted from all the rows of their ProductPrimaryToken, a Token only yields its own row.
+# A csv file is read with its index, an xlsx file is read whole, or from the input cache
+def read_only_rows(file_path, tokens, prefetch=None, metrics=NoMetrics(), input_cache=None):
+    check_file_type(file_path)
+    tokens = [str(token) for token in tokens]
+
+    with metrics.timer("read"):
+        if file_path.endswith(".csv"):
+            index = load_index(file_path)
+            variants = index["variants"]
+            known_tokens = index["groups"]
+        else:
+            df = read_frame(file_path, input_cache)
+            variants = dict(zip(df["Token"].astype(str), df["ProductPrimaryToken"].astype(str)))
+            known_tokens = set(df["ProductPrimaryToken"].astype(str))
+
+        primary_tokens, not_found = find_primary_tokens(tokens, known_tokens, variants)
+        for token in not_found:
+            print("ProductPrimaryToken or Token " + token + " not found!")
+
+        if not primary_tokens:
+            return
+
+        print("Reading the rows of " + ", ".join(primary_tokens) + "...")
+        if file_path.endswith(".csv"):
+            df = read_indexed_frame(file_path, sorted(primary_tokens), index)
+        else:
+            df = df[df["ProductPrimaryToken"].astype(str).isin(primary_tokens)].reset_index(drop=True)
+
+    if prefetch is not None:
+        prefetch(df)
+
+    # Yield all the rows of the ProductPrimaryTokens that were asked for and the rows of the Tokens
+    for data in metrics.timed_iter(iter_rows(df), "extract"):
+        if str(data["ProductPrimaryToken"]) in tokens or str(data["Token"]) in tokens:
+            yield data
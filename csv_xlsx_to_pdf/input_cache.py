@@ -0,0 +1,113 @@
+# Importing libraries
+import glob
+import hashlib
+import json
+import os
+import pickle
+
+import numpy as np
+import pandas as pd
+
+
+# Version of the reading and cleaning of the input files, change it when read_csv, read_xlsx or clean_rows change
+# so the files cached by the previous versions are not used anymore
+INPUT_VERSION = 1
+
+# Maximum number of parsed files kept in the cache, the least recently used are removed first
+INPUT_CACHE_FILES = 8
+
+
+# Hash of the content of the input file, read in blocks so big files are not loaded in memory
+def hash_file(file_path):
+    digest = hashlib.sha256()
+
+    with open(file_path, "rb") as file:
+        for block in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(block)
+
+    return digest.hexdigest()
+
+
+# Path of the cached DataFrame of the input file, keyed by its content and the version of the reading
+def cache_path(directory, file_path):
+    _, file_extension = os.path.splitext(file_path)
+
+    return os.path.join(directory, hash_file(file_path) + file_extension + "-v" + str(INPUT_VERSION) + ".arrow")
+
+
+# Load the cached DataFrame with the file memory-mapped, None if the file was not cached yet or pyarrow is missing
+def load_frame(path):
+    if not os.path.exists(path):
+        return None
+
+    try:
+        import pyarrow as pa
+    except ImportError:
+        return None
+
+    try:
+        with pa.memory_map(path) as source:
+            table = pa.ipc.open_file(source).read_all()
+        df = table.to_pandas()
+
+        # Unpickle the values of the columns mixing text and numbers
+        for column in json.loads(table.schema.metadata[b"pickled"]):
+            df[column] = pd.Series([pickle.loads(value) for value in df[column]], index=df.index, dtype=object)
+
+        df.columns = json.loads(table.schema.metadata[b"columns"])
+    except (OSError, KeyError, ValueError, pickle.UnpicklingError, pa.ArrowException) as e:
+        print("Input cache file is corrupted, reading the input file again:", str(e))
+        return None
+
+    # Mark the file as recently used
+    os.utime(path)
+
+    # Empty values come back as None, give them a NaN value like the input files
+    return df.fillna(value=np.nan)
+
+
+# Save the DataFrame as an uncompressed Arrow file that can be memory-mapped by the next runs
+def save_frame(df, path):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        print("pyarrow is not installed, the parsed input is not cached")
+        return
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+
+    # The columns are stored by position because the names of the columns of an xlsx file can be empty
+    # or repeated, the names are kept in the metadata of the file
+    stored = df.set_axis([str(i) for i in range(len(df.columns))], axis=1)
+    pickled = []
+    try:
+        table = pa.Table.from_pandas(stored, preserve_index=False)
+    except (pa.ArrowException, TypeError, ValueError):
+        # Arrow has no type for the columns mixing text and numbers, like the xlsx columns,
+        # their values are pickled one by one
+        stored = stored.copy()
+        for column in stored.columns:
+            try:
+                pa.array(stored[column], from_pandas=True)
+            except (pa.ArrowException, TypeError, ValueError):
+                stored[column] = [pickle.dumps(value) for value in stored[column]]
+                pickled.append(column)
+        table = pa.Table.from_pandas(stored, preserve_index=False)
+
+    metadata = {
+        b"columns": json.dumps(list(df.columns), default=str).encode("utf-8"),
+        b"pickled": json.dumps(pickled).encode("utf-8"),
+    }
+    table = table.replace_schema_metadata({**table.schema.metadata, **metadata})
+
+    # Write the file under a temporary name first so it is never read half written
+    temp_path = path + ".tmp"
+    with pa.OSFile(temp_path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    os.replace(temp_path, path)
+
+    # Remove the least recently used files when there are too many
+    cached_files = sorted(glob.glob(os.path.join(directory, "*.arrow")), key=os.path.getmtime)
+    for cached_file in cached_files[:-INPUT_CACHE_FILES]:
+        os.remove(cached_file)
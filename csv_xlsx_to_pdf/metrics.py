@@ -0,0 +1,150 @@
+# Importing libraries
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+
+# Value below which the given percent of the sorted samples are, with the nearest rank method
+def percentile(sorted_samples, percent):
+    if not sorted_samples:
+        return 0.0
+
+    rank = max(1, math.ceil(percent / 100 * len(sorted_samples)))
+
+    return sorted_samples[rank - 1]
+
+
+# Wall time, counts and per-sample durations of the stages of a run, and optionally a JSON line for every row.
+# The stages are recorded from the main thread, the rendering threads and the download threads
+class Metrics:
+    def __init__(self, rows_file=None):
+        self.start = time.perf_counter()
+        self.info = {}  # Description of the run, like the file and the backend
+        self.counts = {}
+        self.stages = {}  # Seconds of every sample of every stage
+        self.lock = threading.Lock()
+
+        # Write a JSON line for every row as soon as its pdf file is created or reused
+        self.rows_file = open(rows_file, "w", encoding="utf-8") if rows_file else None
+
+    # Add one sample to a stage
+    def add(self, stage, seconds):
+        with self.lock:
+            self.stages.setdefault(stage, []).append(seconds)
+
+    # Time the code of a with block as one sample of a stage
+    @contextmanager
+    def timer(self, stage):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(stage, time.perf_counter() - start)
+
+    # Yield the items of an iterable and record the time spent producing all of them as one sample of a stage
+    def timed_iter(self, iterable, stage):
+        iterator = iter(iterable)
+        seconds = 0.0
+
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    seconds += time.perf_counter() - start
+
+                yield item
+        finally:
+            self.add(stage, seconds)
+
+    # Increase a counter
+    def count(self, name, value=1):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + value
+
+    # Write the JSON line of a row
+    def row(self, record):
+        if self.rows_file is None:
+            return
+
+        line = json.dumps(record, default=str, ensure_ascii=False)
+        with self.lock:
+            self.rows_file.write(line + "\n")
+
+    # Summary of the run: wall time, throughput, counts and the latency percentiles of every stage
+    def summary(self):
+        wall_seconds = time.perf_counter() - self.start
+
+        with self.lock:
+            stages = {}
+            for stage, samples in self.stages.items():
+                samples = sorted(samples)
+                stages[stage] = {
+                    "count": len(samples),
+                    "total_seconds": sum(samples),
+                    "p50": percentile(samples, 50),
+                    "p95": percentile(samples, 95),
+                    "p99": percentile(samples, 99),
+                    "max": samples[-1] if samples else 0.0,
+                }
+            counts = dict(self.counts)
+
+        return {
+            **self.info,
+            "wall_seconds": wall_seconds,
+            "rows_per_second": counts.get("rows", 0) / wall_seconds if wall_seconds else 0.0,
+            "pdf_files_per_second": counts.get("created", 0) / wall_seconds if wall_seconds else 0.0,
+            "counts": counts,
+            "stages": stages,
+        }
+
+    # Write the summary to a JSON file, or print it when the file is "-"
+    def write_summary(self, summary_file):
+        summary = json.dumps(self.summary(), indent=2)
+
+        if summary_file == "-":
+            print(summary)
+            return
+
+        with open(summary_file, "w", encoding="utf-8") as file:
+            file.write(summary + "\n")
+
+    def close(self):
+        if self.rows_file is not None:
+            self.rows_file.close()
+
+
+# Metrics of a run without instrumentation, every method does nothing
+class NoMetrics(Metrics):
+    def __init__(self):
+        self.info = {}
+
+    def add(self, stage, seconds):
+        pass
+
+    def timer(self, stage):
+        return NULL_TIMER
+
+    def timed_iter(self, iterable, stage):
+        return iterable
+
+    def count(self, name, value=1):
+        pass
+
+    def row(self, record):
+        pass
+
+    def summary(self):
+        return dict(self.info)
+
+    def close(self):
+        pass
+
+
+# Shared with block of the timers of NoMetrics
+NULL_TIMER = nullcontext()
@@ -0,0 +1,88 @@
+# Importing libraries
+import hashlib
+import json
+import os
+import shutil
+from datetime import date
+
+
+# Version of the page layout, increase it when the layout changes so every pdf file is created again
+LAYOUT_VERSION = 2
+
+# File storing the content hash and the date folder of every pdf file
+MANIFEST_FILE = "PDF/manifest.json"
+
+
+# Create the PDF folder of the current date folder and return its path
+def create_pdf_folder():
+    if not os.path.exists("PDF"):
+        print("Creating PDF folder...")
+        os.makedirs("PDF", exist_ok=True)
+    if not os.path.exists("PDF/" + str(date.today())):
+        print("Creating " + str(date.today()) + " folder...")
+        os.makedirs("PDF/" + str(date.today()), exist_ok=True)
+
+    return "PDF/" + str(date.today())
+
+
+# Load the manifest of the previous runs
+def load_manifest():
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+
+    try:
+        with open(MANIFEST_FILE, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except ValueError:
+        print("Manifest is corrupted, creating every pdf file again...")
+        return {}
+
+
+# Save the manifest for the next runs
+def save_manifest(manifest):
+    os.makedirs(os.path.dirname(MANIFEST_FILE), exist_ok=True)
+
+    with open(MANIFEST_FILE, "w", encoding="utf-8") as file:
+        json.dump(manifest, file)
+
+
+# Hash of everything used to create the pdf file of a row, the backend is part of it
+# because every backend draws a different pdf file
+def hash_row(data, backend, image_digest=""):
+    content = json.dumps([LAYOUT_VERSION, backend, data, image_digest], default=str, ensure_ascii=False)
+
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+# Hash of all the rows of a pdf file, the pdf file of a single row keeps the hash of the row
+def hash_rows(row_hashes):
+    if len(row_hashes) == 1:
+        return row_hashes[0]
+
+    return hashlib.sha256("".join(row_hashes).encode("utf-8")).hexdigest()
+
+
+# Bring the pdf file of a previous run into the current date folder if the row did not change,
+# return True if the pdf file of the current date folder is up to date
+def reuse_pdf(pdf_file, row_hash, manifest):
+    entry = manifest.get(pdf_file)
+    if entry is None or entry["hash"] != row_hash:
+        return False
+
+    file_path = "PDF/" + str(date.today()) + "/" + pdf_file
+    previous_file_path = "PDF/" + entry["date"] + "/" + pdf_file
+
+    if not os.path.exists(file_path):
+        if not os.path.exists(previous_file_path):
+            return False
+
+        # Hard link the previous pdf file, or copy it if the file system does not support hard links
+        os.makedirs("PDF/" + str(date.today()), exist_ok=True)
+        try:
+            os.link(previous_file_path, file_path)
+        except OSError:
+            shutil.copy2(previous_file_path, file_path)
+
+    entry["date"] = str(date.today())
+
+    return True
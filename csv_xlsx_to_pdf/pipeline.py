@@ -0,0 +1,112 @@
+# Importing libraries
+import os
+from datetime import date
+
+from .core import iter_outputs, read_rows
+from .index import read_only_rows
+from .metrics import NoMetrics
+from .output import hash_rows, load_manifest, reuse_pdf, save_manifest
+from .renderers import DEFAULT_BACKEND, check_renderer_options, load_renderer
+from .shards import load_shard_manifest, save_shard_manifest, shard_name
+
+
+# Create the pdf files of the rows with the renderer, or reuse the pdf files of the previous runs whose rows
+# did not change, and record the content hashes in the manifest. Return the paths of the pdf files and the number
+# of reused pdf files, the renderer is finished but not closed
+def render_rows(renderer, rows, combine, name, manifest, force=False, metrics=NoMetrics()):
+    try:
+        return create_pdf_files(renderer, rows, combine, name, manifest, force, metrics)
+    finally:
+        # The work prefetched for the rows that were not rendered is not needed by the next runs
+        renderer.cancel_prefetch()
+
+
+# Create or reuse the pdf files of the rows, see render_rows
+def create_pdf_files(renderer, rows, combine, name, manifest, force, metrics):
+    reused = 0
+    pdf_files = []
+
+    # Iterate over the rows and create a pdf file for each row, or for each group of rows
+    for pdf_file, group in iter_outputs(rows, combine, name):
+        pdf_files.append("PDF/" + str(date.today()) + "/" + pdf_file)
+        metrics.count("rows", len(group))
+        metrics.count("pdf_files")
+
+        # Reuse the pdf file of a previous run if the rows did not change
+        with metrics.timer("hash"):
+            row_hash = hash_rows([renderer.hash_row(data) for data in group])
+        if not force and reuse_pdf(pdf_file, row_hash, manifest):
+            reused += 1
+            metrics.count("reused")
+            for data in group:
+                metrics.row(
+                    {"pdf_file": pdf_file, "ProductPrimaryToken": data["ProductPrimaryToken"],
+                     "Token": data["Token"], "reused": True}
+                )
+            continue
+        manifest[pdf_file] = {"hash": row_hash, "date": str(date.today())}
+        metrics.count("created")
+
+        # Remove an outdated pdf file first, it may be a hard link to the pdf file of a previous run
+        if os.path.exists("PDF/" + str(date.today()) + "/" + pdf_file):
+            os.remove("PDF/" + str(date.today()) + "/" + pdf_file)
+
+        with metrics.timer("render"):
+            renderer.render(pdf_file, group)
+
+    # Create the remaining pdf files
+    with metrics.timer("finish"):
+        renderer.finish()
+
+    return pdf_files, reused
+
+
+# Convert a csv or xlsx file to pdf files in the PDF folder of the current date folder and return their paths.
+# The parsed file is kept in the input_cache folder for the next runs, None parses it every time.
+# only is a list of ProductPrimaryTokens and Tokens, only their pdf files are created, see read_only_rows.
+# shard is (i, N) to create only the pdf files of the shard i of N with its own manifest, see merge_shards.
+# The timings of the run are recorded in metrics when it is given, see Metrics.
+# The other options are given to the renderer of the backend, like batch_size for html or converter for docx,
+# a name that no renderer knows raises a TypeError
+def convert(file_path, backend=DEFAULT_BACKEND, workers=None, stream=False, chunk_size=50000, presorted=False,
+            force=False, combine=None, metrics=None, input_cache="input_cache", only=None, shard=None, **options):
+    check_renderer_options(options)
+    if only and shard is not None:
+        raise ValueError("--only and --shard cannot be used together")
+    if only and combine == "file":
+        raise ValueError("--only cannot be used with --combine file, the catalogue would only have these products")
+    if metrics is None:
+        metrics = NoMetrics()
+    metrics.info.update(file=file_path, backend=backend, combine=combine, shard=shard)
+    name = os.path.splitext(os.path.basename(file_path))[0]
+
+    renderer = load_renderer(backend)(workers=workers, combine=combine, metrics=metrics, **options)
+    try:
+        if only:
+            rows = read_only_rows(file_path, only, renderer.prefetch, metrics, input_cache)
+        else:
+            rows = read_rows(
+                file_path, stream, max(1, chunk_size), presorted, renderer.prefetch, metrics, input_cache, shard
+            )
+
+        # Load the content hashes of the pdf files created by the previous runs,
+        # they are kept with only because the other pdf files are not created again
+        if shard is not None:
+            manifest = {} if force else load_shard_manifest(name, shard)
+        else:
+            manifest = {} if force and not only else load_manifest()
+
+        # The catalogue of a shard is named after the shard so the catalogues of the shards can be put together
+        output_name = shard_name(name, shard) if shard is not None else name
+        pdf_files, reused = render_rows(renderer, rows, combine, output_name, manifest, force, metrics)
+    finally:
+        renderer.close()
+
+    # Save the content hashes of the pdf files for the next run, a shard only saves the pdf files of the shard
+    if shard is not None:
+        save_shard_manifest(name, shard, combine, manifest, pdf_files)
+    else:
+        save_manifest(manifest)
+    print("Reused " + str(reused) + " unchanged pdf files from previous runs")
+
+    return pdf_files
@@ -0,0 +1,47 @@
+# Importing libraries
+import importlib
+import sys
+
+from .base import Renderer
+
+
+# Backend used when none is given: word documents on Windows and wkhtmltopdf everywhere else
+DEFAULT_BACKEND = "docx" if sys.platform == "win32" else "html"
+
+# Renderers that can be selected with --backend: the module and the class of every renderer,
+# the module and its libraries are only imported when the backend is used
+RENDERERS = {
+    "html": ("html", "HtmlRenderer"),
+    "docx": ("docx", "DocxRenderer"),
+    "native": ("native", "NativeRenderer"),
+}
+
+# Options of the renderers of every backend, besides workers, combine and metrics. Every renderer ignores the options
+# of the other backends so the same options can be given to every renderer, the other names are mistakes
+RENDERER_OPTIONS = {
+    "batch_size", "dump_dir",  # html
+    "queue_size", "converter", "bulk",  # docx and native
+    "image_cache", "image_cache_size", "image_max_age", "download_workers", "per_host", "timeout",  # images
+    "image_dpi", "image_quality",
+}
+
+
+# Raise an error for the options that no renderer knows, they would be ignored
+def check_renderer_options(options):
+    unknown = sorted(set(options) - RENDERER_OPTIONS)
+    if unknown:
+        raise TypeError("Unknown options " + ", ".join(unknown) + ", use " + ", ".join(sorted(RENDERER_OPTIONS)))
+
+
+# Import the module of a backend and return its renderer class
+def load_renderer(backend):
+    if backend not in RENDERERS:
+        raise ValueError("Unknown backend " + str(backend) + ", use one of " + ", ".join(sorted(RENDERERS)))
+
+    module_name, class_name = RENDERERS[backend]
+    module = importlib.import_module("." + module_name, __name__)
+
+    return getattr(module, class_name)
+
+
+__all__ = ["DEFAULT_BACKEND", "RENDERERS", "RENDERER_OPTIONS", "Renderer", "check_renderer_options", "load_renderer"]
@@ -0,0 +1,42 @@
+# Importing libraries
+from ..metrics import NoMetrics
+from ..output import hash_row
+
+
+# Base class of the renderers creating the pdf files of the rows, one renderer is created for every run.
+# The options of the other renderers are ignored, so the same options can be given to every renderer
+class Renderer:
+    # Name of the backend of the renderer, like --backend, it is part of the content hash of the rows
+    name = None
+
+    # Number of workers used when it is not given
+    default_workers = 1
+
+    def __init__(self, workers=None, combine=None, metrics=None, **options):
+        self.workers = max(1, workers or self.default_workers)
+        self.combine = combine  # None, "token" or "file" like --combine
+        self.metrics = metrics if metrics is not None else NoMetrics()
+
+    # Start the work needed by a block of rows before they are rendered, the DataFrame has all the rows of the block
+    def prefetch(self, df):
+        pass
+
+    # Hash of everything used to create the pdf file of a row
+    def hash_row(self, data):
+        return hash_row(data, self.name)
+
+    # Forget the work started by prefetch for the rows that were not rendered, called at the end of every run
+    def cancel_prefetch(self):
+        pass
+
+    # Create the pdf file of a group of rows in the PDF folder of the current date folder, it may be created later
+    def render(self, pdf_file, group):
+        raise NotImplementedError
+
+    # Create the remaining pdf files at the end of the run, the renderer can create more pdf files afterwards
+    def finish(self):
+        pass
+
+    # Release the workers and the temporary files, also called when the run is interrupted
+    def close(self):
+        pass
@@ -0,0 +1,39 @@
+# Importing libraries
+import glob
+import os
+import shutil
+import subprocess
+
+
+# Convert a docx file, or every docx file of a folder, to pdf files in the output folder with Microsoft Word
+def convert_with_word(input_path, output_dir):
+    # docx2pdf is only imported when word is used, it starts Word through COM on Windows
+    from docx2pdf import convert
+
+    convert(input_path, output_dir)
+
+
+# Convert a docx file, or every docx file of a folder, to pdf files in the output folder with headless LibreOffice
+def convert_with_libreoffice(input_path, output_dir):
+    soffice = shutil.which("soffice") or shutil.which("libreoffice")
+    if soffice is None:
+        raise RuntimeError("LibreOffice was not found, install it or use --converter word")
+
+    if os.path.isdir(input_path):
+        docx_files = sorted(glob.glob(os.path.join(input_path, "*.docx")))
+    else:
+        docx_files = [input_path]
+
+    # Convert the files in chunks so the command line stays short enough for Windows
+    for i in range(0, len(docx_files), 200):
+        subprocess.run(
+            [soffice, "--headless", "--convert-to", "pdf", "--outdir", output_dir] + docx_files[i:i + 200],
+            check=True, stdout=subprocess.DEVNULL,
+        )
+
+
+# Converters that can be selected with --converter
+CONVERTERS = {
+    "word": convert_with_word,
+    "libreoffice": convert_with_libreoffice,
+}
@@ -0,0 +1,216 @@
+# Importing libraries
+import glob
+import hashlib
+import os
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from ..images import ImageCache, prefetch_images, select_image_url
+from ..output import create_pdf_folder, hash_row
+from .base import Renderer
+
+
+# Split the bullet points of a row by the new line character
+def split_bullet_points(value):
+    if isinstance(value, str):
+        if "\r\n" in value:
+            items = value.split("\r\n")
+        elif "\n" in value:
+            items = value.split("\n")
+        else:
+            items = [value]
+        return [item.lstrip("- ") for item in items]
+
+    if isinstance(value, float):
+        return [item.lstrip("- ") for item in str(value).split("\r\n") if item]
+
+    return value
+
+
+# Build the document of a row in a worker process and return its content with the seconds spent building it
+def build_timed(build_document, data, image_content):
+    start = time.perf_counter()
+    content = build_document(data, image_content)
+
+    return content, time.perf_counter() - start
+
+
+# Merge the pdf files of the documents into one pdf file,
+# with a bookmark for every ProductPrimaryToken and, under it, for every Token
+def merge_pdf_files(pages_dir, documents, pdf_file):
+    # pypdf is only imported when the documents are merged with --combine
+    from pypdf import PdfReader, PdfWriter
+
+    writer = PdfWriter()
+    parent = None
+    parent_token = None
+
+    for staged_file, primary_token, token in documents:
+        page_file = os.path.join(pages_dir, os.path.splitext(staged_file)[0] + ".pdf")
+        if not os.path.exists(page_file):
+            print("Error while creating PDF: no pages found for " + primary_token + "_" + token)
+            continue
+
+        # Add the pages of the document and a bookmark at its first page
+        first_page = len(writer.pages)
+        for page in PdfReader(page_file).pages:
+            writer.add_page(page)
+
+        if parent is None or primary_token != parent_token:
+            parent = writer.add_outline_item(primary_token, first_page)
+            parent_token = primary_token
+        writer.add_outline_item(token, first_page, parent=parent)
+
+    with open(pdf_file, "wb") as file:
+        writer.write(file)
+
+
+# Convert all the documents of a staging folder with a single conversion pass,
+# then merge the pdf files of every group of documents into one pdf file
+def create_pdf_combined(staging_dir, converter, combined_files):
+    output_dir = create_pdf_folder()
+
+    with tempfile.TemporaryDirectory() as pages_dir:
+        # The staged documents are already pdf files when there is no converter
+        if converter is None:
+            pages_dir = staging_dir
+        else:
+            print("Converting " + str(len(glob.glob(os.path.join(staging_dir, "*.docx")))) + " documents...")
+            converter(staging_dir, pages_dir)
+
+        for pdf_file, documents in combined_files:
+            print("Creating " + pdf_file + "...")
+            try:
+                merge_pdf_files(pages_dir, documents, os.path.join(output_dir, pdf_file))
+            except Exception as e:
+                print("Error while creating PDF:", str(e))
+
+
+# Renderer building the document of every row in a pool of worker processes, with the image of the row
+# from the image cache, while the documents built before are saved in the order of the rows
+class DocumentRenderer(Renderer):
+    default_workers = os.cpu_count() or 1
+
+    # Function building the document of a row in a worker process from the data and the image content of the row
+    build_document = None
+
+    # Program converting the staged documents to pdf files, None when the documents are pdf files already
+    converter = None
+
+    def __init__(self, workers=None, combine=None, queue_size=None, image_cache="image_cache",
+                 image_cache_size=500, image_max_age=24, download_workers=8, per_host=4, timeout=30,
+                 image_dpi=150, image_quality=85, **options):
+        super().__init__(workers, combine, **options)
+        self.queue_size = max(1, queue_size or 2 * self.workers)  # Maximum documents waiting to be saved
+
+        # Download and normalize the images of the rows in the background, sizes are in MB and ages in hours
+        # like the options
+        self.image_cache = ImageCache(
+            image_cache, image_cache_size * 1024 * 1024, image_max_age * 3600,
+            workers=download_workers, per_host=per_host, timeout=timeout, dpi=image_dpi, quality=image_quality,
+            metrics=self.metrics,
+        )
+
+        # Build the documents in worker processes, every document gets its own file
+        # in a temporary folder that is removed at the end of the run
+        self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pending = deque()
+
+        # Documents of every combined pdf file, they are staged and merged at the end of the run
+        self.staging = combine is not None
+        self.combined_files = []
+        self.staged = 0
+
+    def prefetch(self, df):
+        # Download the images of the rows in the background while the documents are created
+        prefetch_images(df, self.image_cache)
+
+    def cancel_prefetch(self):
+        self.image_cache.cancel_prefetch()
+
+    # Get the image of the row from the image cache, None if the row has no image or it is not found.
+    # The image of a row is counted in the hits or misses of the cache by hash_row, render does not count it again
+    def image(self, data, count=True):
+        image_url = select_image_url(data["Image_ProductPrimary"])
+
+        return self.image_cache.get(image_url, count) if image_url is not None else None
+
+    # The image of the row is part of its content hash
+    def hash_row(self, data):
+        image_content = self.image(data)
+        image_digest = hashlib.sha256(image_content).hexdigest() if image_content is not None else ""
+
+        return hash_row(data, self.name, image_digest)
+
+    def render(self, pdf_file, group):
+        documents = []
+        for data in group:
+            started = time.perf_counter()
+            image_content = self.image(data, count=False)
+            if image_content is None:
+                print("No image found for " + data["ProductPrimaryToken"] + "!")
+
+            record = {
+                "pdf_file": pdf_file, "ProductPrimaryToken": data["ProductPrimaryToken"], "Token": data["Token"],
+                "reused": False, "image": image_content is not None,
+            }
+
+            # The documents of a combined pdf file are staged under a numbered name
+            staged_file = pdf_file
+            if self.combine:
+                staged_file = str(self.staged).zfill(6) + ".pdf"
+                self.staged += 1
+                documents.append((staged_file, data["ProductPrimaryToken"], data["Token"]))
+
+            # Save the oldest documents while the queue of documents waiting to be saved is full
+            while len(self.pending) >= self.queue_size:
+                self.save_next()
+
+            future = self.executor.submit(build_timed, self.build_document, data, image_content)
+            self.pending.append((future, staged_file, record, started))
+
+        if self.combine:
+            self.combined_files.append((pdf_file, documents))
+
+    # Wait for the oldest document built in a worker process, save it and record the timings of its row
+    def save_next(self):
+        future, staged_file, record, started = self.pending.popleft()
+
+        content, record["build"] = future.result()
+        self.metrics.add("build", record["build"])
+        self.save_document(content, staged_file, record)
+
+        latency = time.perf_counter() - started
+        self.metrics.add("document", latency)
+        self.metrics.row({**record, "latency": latency})
+
+    # Save the content of a document under the name of its pdf file, the timings are added to the record of its row
+    def save_document(self, content, staged_file, record):
+        raise NotImplementedError
+
+    def finish(self):
+        # Save the remaining documents
+        while self.pending:
+            self.save_next()
+
+        self.convert_staged()
+
+        # Remove the staged documents so the renderer can create the next pdf files
+        for staged_file in os.listdir(self.temp_dir.name):
+            os.remove(os.path.join(self.temp_dir.name, staged_file))
+        self.combined_files = []
+
+    # Create the pdf files of the documents of the staging folder
+    def convert_staged(self):
+        # Convert all the documents of the staging folder at once and merge them
+        if self.combine and self.combined_files:
+            with self.metrics.timer("combine"):
+                create_pdf_combined(self.temp_dir.name, self.converter, self.combined_files)
+
+    def close(self):
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.temp_dir.cleanup()
+        self.image_cache.close()
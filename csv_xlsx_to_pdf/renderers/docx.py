@@ -0,0 +1,307 @@
+# Importing libraries
+import glob
+import os
+import time
+from collections import OrderedDict
+from io import BytesIO
+
+from docx import Document
+from docx.shared import Inches, Pt
+from docx.enum.table import WD_CELL_VERTICAL_ALIGNMENT
+from docx.oxml.ns import nsdecls
+from docx.oxml import parse_xml
+from docx.shared import RGBColor
+
+from ..images import IMAGE_NOT_FOUND
+from ..output import create_pdf_folder
+from .converters import CONVERTERS
+from .documents import DocumentRenderer, split_bullet_points
+
+
+# Characteristics tables built by the last documents, shared by all the variants of a ProductPrimaryToken
+characteristics_tables = OrderedDict()
+CHARACTERISTICS_TABLES_SIZE = 64
+
+
+# Add the characteristics table to the document, reusing the table xml built for the same characteristics
+def add_characteristics_table(doc, data):
+    cache_key = tuple(data["Characteristics"].items())
+    if cache_key in characteristics_tables:
+        characteristics_tables.move_to_end(cache_key)
+        doc.element.body.sectPr.addprevious(parse_xml(characteristics_tables[cache_key]))
+        return
+
+    # Create a list of characteristics
+    characteristics = []
+
+    # Iterate over the characteristics dictionaries to create the list
+    for key, val in data["Characteristics"].items():
+        key = key.replace("Attribute_", "")
+        characteristics.append(f"{key}: {val}")
+
+    # Determine the number of rows needed for characteristics table
+    num_rows_characteristics = (len(characteristics) + 1) // 2
+
+    # Add a new table for characteristics bullet points
+    characteristics_table = doc.add_table(rows=num_rows_characteristics, cols=2)
+    characteristics_table.allow_autofit = False
+    characteristics_table.columns[0].width = Inches(3.5)
+    characteristics_table.columns[1].width = Inches(3.5)
+
+    # Set table properties for background shading
+    tbl_props = characteristics_table._element.xpath('.//w:tblPr')
+    tbl_shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="d6d6d6"/>')
+    tbl_props.append(tbl_shading)
+
+
+    # Populate the bullet points in the characteristics table
+    row_index = 0
+    col_index = 0
+    counter = 0
+
+    for i in range(len(characteristics)):
+        cell = characteristics_table.cell(row_index, col_index)
+        cell.width = Inches(3.5)
+
+        if counter < len(characteristics):
+            cell.text = characteristics[counter]
+
+        counter += 1
+
+        col_index += 1
+        if col_index >= 2:
+            col_index = 0
+            row_index += 1
+
+    # Set cell shading (background color) for cells under "Caracteristicas" heading
+    for row in characteristics_table.rows:
+        for cell in row.cells:
+            if cell.text:
+                cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER  # Adjust vertical alignment
+                shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="d6d6d6"/>')
+                cell._element.tcPr.append(shading)
+                paragraph = cell.paragraphs[0]
+                paragraph_format = paragraph.paragraph_format
+                paragraph_format.space_before = Pt(5)  # Adjust the value as needed for top padding
+                paragraph_format.space_after = Pt(5)   # Adjust the value as needed for bottom padding
+
+    # Keep the table xml for the next variants of the ProductPrimaryToken
+    characteristics_tables[cache_key] = characteristics_table._tbl.xml
+    if len(characteristics_tables) > CHARACTERISTICS_TABLES_SIZE:
+        characteristics_tables.popitem(last=False)
+
+
+# Create a word document and return the content of the docx file, runs in a worker process
+def create_word_document(data, image_content):
+    # Create a new Word document
+    doc = Document()
+
+    # Set page size (e.g., A4)
+    section = doc.sections[0]
+    section.page_width = Inches(8.27)  # Width of A4 in inches
+    section.page_height = Inches(11.69)  # Height of A4 in inches
+
+    # Set margins (e.g., 1 inch on all sides)
+    section.left_margin = Inches(0.5)
+    section.right_margin = Inches(0.5)
+    section.top_margin = Inches(1)
+    section.bottom_margin = Inches(1)
+
+    # Set the default paragraph style
+    default_style = doc.styles['Normal']
+    default_style.font.size = Pt(11)  # Set default font size to 11 points
+    default_style.font.name = 'Calibri'  # Set default font to Calibri
+    default_style.paragraph_format.line_spacing = 1.5  # Set line spacing to 1.5 times the font size
+
+    # Calculate the table and paragraph widths based on page dimensions
+    table_width = int(section.page_width - section.left_margin - section.right_margin)
+    text_column_width = int(table_width * 0.5)  # Adjust as desired
+    image_column_width = int(table_width - text_column_width)
+
+    # Add a table with 2 columns
+    table = doc.add_table(rows=1, cols=2)
+    table.allow_autofit = False
+    table.columns[0].width = image_column_width
+    table.columns[1].width = text_column_width
+
+    # Get the first row of the table
+    row = table.rows[0]
+
+    # Add the image of the row on the left side with custom size
+    if image_content is not None:
+        image_data = BytesIO(image_content)
+    else:
+        image_data = IMAGE_NOT_FOUND
+
+    cell_image = row.cells[0]
+    cell_image.width = Inches(3.7)
+    cell_image.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER  # Align content vertically to center
+    cell_image.add_paragraph().add_run().add_picture(image_data, width=Inches(3.61))
+
+    # Add text on the right side
+    cell_text = row.cells[1]
+    cell_text.width = Inches(3.5)
+    cell_text.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER  # Align content vertically to center
+    cell_text_paragraph = cell_text.add_paragraph()
+
+    # Add the text content
+    cell_text_paragraph.add_run("Referencia de Producto: ").bold = True
+    cell_text_paragraph.add_run(data["ProductPrimaryToken"] + "\n")
+    cell_text_paragraph.add_run("Nombre de Producto: ").bold = True
+    cell_text_paragraph.add_run(data["Name_es"] + "\n")
+    cell_text_paragraph.add_run("Descripción de Producto:\n").bold = True
+    cell_text_paragraph.add_run(str(data["ProductSection_T2_INFO_es"]).replace("\n", "") + "\n")
+
+    # Add a heading with black font color
+    heading = doc.add_heading('Bullet', level=1)
+    run = heading.runs[0]
+    run.font.color.rgb = RGBColor(0, 0, 0)  # Set RGB values to (0, 0, 0) for black
+
+
+    # Split the bullet points by the new line character
+    bullet_points = split_bullet_points(data["Attribute_BulletPointsProducto"])
+
+
+    # Add bullet points under the heading in 2 columns
+    # Create a paragraph with bullet points
+    paragraph = doc.add_paragraph()
+    paragraph_format = paragraph.paragraph_format
+    paragraph_format.space_before = Pt(15)  # Adjust the value as needed for top padding
+    paragraph_format.space_after = Pt(15)   # Adjust the value as needed for bottom padding
+
+    for bullet_point in bullet_points:
+        paragraph.add_run('• ').bold = True  # Add bullet symbol (you can customize it)
+        paragraph.add_run(bullet_point + '\n')
+
+    # Apply shading (background color fill) to the paragraph
+    shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="d6d6d6"/>')
+    paragraph._element.get_or_add_pPr().append(shading)
+
+    # Add a heading for characteristics
+    heading = doc.add_heading('Caracteristicas', level=1)
+    run = heading.runs[0]
+    run.font.color.rgb = RGBColor(0, 0, 0)  # Set RGB values to (0, 0, 0) for black
+
+
+    # Add the characteristics table, built once for all the variants of a ProductPrimaryToken
+    add_characteristics_table(doc, data)
+
+    # Add a heading
+    heading = doc.add_heading('Atributos', level=1)
+    run = heading.runs[0]
+    run.font.color.rgb = RGBColor(0, 0, 0)  # Set RGB values to (0, 0, 0) for black
+
+
+    # Add a new table for attributes bullet points
+    attr_table = doc.add_table(rows=2, cols=2)
+    attr_table.allow_autofit = False
+    attr_table.columns[0].width = Inches(3.5)
+    attr_table.columns[1].width = Inches(3.5)
+
+    # Create a list of attributes
+    attributes = []
+
+    # Iterate over the attributes dictionaries to create the list
+    for key, val in data["Attributes"].items():
+        key = key.replace("Attribute_", "")
+        attributes.append(f"{key}: {val}")
+
+   # Populate the table with attributes
+    counter = 0
+    for attribute in attributes:
+        row_index = counter // 2
+        col_index = counter % 2
+
+        if col_index == 0:
+            attr_table.add_row()
+
+        cell = attr_table.cell(row_index, col_index)
+        cell.width = Inches(3.5)
+        cell.text = attribute
+
+        counter += 1
+
+
+    # Set cell shading (background color) for cells under "Caracteristicas" heading
+    for row in attr_table.rows:
+        for cell in row.cells:
+            if cell.text:
+                cell.vertical_alignment = WD_CELL_VERTICAL_ALIGNMENT.CENTER  # Adjust vertical alignment
+                shading = parse_xml(f'<w:shd {nsdecls("w")} w:fill="d6d6d6"/>')
+                cell._element.tcPr.append(shading)
+                paragraph = cell.paragraphs[0]
+                paragraph_format = paragraph.paragraph_format
+                paragraph_format.space_before = Pt(5)  # Adjust the value as needed for top padding
+                paragraph_format.space_after = Pt(5)   # Adjust the value as needed for bottom padding
+
+
+    # Save the Word document in memory
+    docx_file = BytesIO()
+    doc.save(docx_file)
+
+    return docx_file.getvalue()
+
+
+# Create a pdf file from a docx file and save it in the PDF folder of the current date folder
+def create_pdf(docx_file, converter):
+    output_dir = create_pdf_folder()
+
+    print("Creating " + os.path.splitext(os.path.basename(docx_file))[0] + ".pdf...")
+    converter(docx_file, output_dir)
+
+
+# Create the pdf files of all the docx files of a staging folder with a single conversion pass
+def create_pdf_bulk(staging_dir, converter):
+    output_dir = create_pdf_folder()
+
+    print("Creating " + str(len(glob.glob(os.path.join(staging_dir, "*.docx")))) + " pdf files...")
+    converter(staging_dir, output_dir)
+
+
+# Write a word document built in a worker process to its own docx file,
+# then convert it unless all the documents are converted together at the end of the run
+def save_word_document(docx_content, pdf_file, temp_dir, converter, staging):
+    docx_file = os.path.join(temp_dir, os.path.splitext(pdf_file)[0] + ".docx")
+
+    with open(docx_file, "wb") as file:
+        file.write(docx_content)
+
+    if staging:
+        return
+
+    try:
+        create_pdf(docx_file, converter)
+    finally:
+        os.remove(docx_file)
+
+
+# Renderer building a word document for every row and converting it to pdf with --converter,
+# one document at a time or all the documents in a single pass at the end of the run
+class DocxRenderer(DocumentRenderer):
+    name = "docx"
+    build_document = staticmethod(create_word_document)
+
+    def __init__(self, workers=None, combine=None, converter="word", bulk=False, **options):
+        super().__init__(workers, combine, **options)
+        self.converter = CONVERTERS[converter]
+        self.bulk = bulk
+
+        # The docx files are converted at the end of the run with --bulk or --combine
+        self.staging = bulk or combine is not None
+
+    def save_document(self, content, staged_file, record):
+        start = time.perf_counter()
+        save_word_document(content, staged_file, self.temp_dir.name, self.converter, self.staging)
+
+        # The staged documents are converted together at the end of the run
+        if not self.staging:
+            record["convert"] = time.perf_counter() - start
+            self.metrics.add("convert", record["convert"])
+
+    def convert_staged(self):
+        super().convert_staged()
+
+        # Convert all the documents of the staging folder at once
+        if not self.combine and self.bulk and os.listdir(self.temp_dir.name):
+            with self.metrics.timer("bulk_convert"):
+                create_pdf_bulk(self.temp_dir.name, self.converter)
@@ -0,0 +1,519 @@
+# Importing libraries
+import hashlib
+import os
+import re
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from functools import lru_cache
+from html import escape
+from pathlib import Path
+from string import Formatter
+
+import pdfkit
+
+from ..images import IMAGE_NOT_FOUND, ImageCache, prefetch_images, select_image_url
+from ..output import create_pdf_folder, hash_row
+from .base import Renderer
+
+
+# Folder of the stylesheet and its fonts
+STYLE_DIR = os.path.realpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Options passed to wkhtmltopdf for every pdf file. The html files can only read the local files of the folders
+# allowed, so the fields of a row cannot pull other local files into the pdf files
+PDF_OPTIONS = {
+    "page-size": "A4",
+    "margin-top": "3.67cm",
+    "margin-right": "1.32cm",
+    "margin-bottom": "2.54cm",
+    "margin-left": "1.32cm",
+    "encoding": "UTF-8",
+    "disable-local-file-access": "",
+    "allow": [STYLE_DIR],
+    "quiet": "",
+}
+
+# Invisible link added at the top of every document of a batch to find the page where it starts. The link is
+# a link annotation of the page in the pdf file, not text, and it is removed once the page is found
+BATCH_MARKER = (
+    '<a href="https://batch.invalid/{}" style="position:absolute;top:0;left:0;display:block;width:1px;height:1px">'
+    "</a>"
+)
+BATCH_MARKER_PATTERN = re.compile(r"^https://batch\.invalid/(\d+)$")
+
+
+# Create a pdf file
+def create_pdf(html_content, pdf_file, options=PDF_OPTIONS):
+    try:
+        pdfkit.from_string(html_content, pdf_file, options=options)
+    except Exception as e:
+        print("Error while creating PDF:", str(e))
+
+
+# Remove the batch markers from the link annotations of a page and return the documents they mark
+def pop_batch_markers(page):
+    from pypdf.generic import ArrayObject, NameObject
+
+    if "/Annots" not in page:
+        return []
+
+    indexes = []
+    annotations = ArrayObject()
+    for annotation in page["/Annots"]:
+        link = annotation.get_object()
+        action = link["/A"] if "/A" in link else {}
+        match = BATCH_MARKER_PATTERN.match(str(action["/URI"])) if "/URI" in action else None
+        if match:
+            indexes.append(int(match.group(1)))
+        else:
+            annotations.append(annotation)
+    page[NameObject("/Annots")] = annotations
+
+    return indexes
+
+
+# Render several documents into one pdf file with a single wkhtmltopdf call and find the first page of every document
+def render_documents(html_contents, temp_dir, options=PDF_OPTIONS):
+    # pypdf is only imported when several documents are rendered together
+    from pypdf import PdfReader
+
+    # Write every document to its own html file with a marker to find its first page
+    html_files = []
+    for index, html_content in enumerate(html_contents):
+        html_file = os.path.join(temp_dir, str(index) + ".html")
+        with open(html_file, "w", encoding="utf-8") as file:
+            file.write(html_content.replace("<body>", "<body>" + BATCH_MARKER.format(index), 1))
+        html_files.append(html_file)
+
+    # Render all the documents into one pdf file, every document starts on a new page
+    combined_pdf = os.path.join(temp_dir, "batch.pdf")
+    pdfkit.from_file(html_files, combined_pdf, options=options)
+
+    # Find the first page of every document, the markers are not copied to the pdf files
+    reader = PdfReader(combined_pdf)
+    first_pages = {}
+    for page_number, page in enumerate(reader.pages):
+        for index in pop_batch_markers(page):
+            first_pages.setdefault(index, page_number)
+
+    return reader, first_pages
+
+
+# Create the pdf files of several documents with a single wkhtmltopdf call
+def create_pdf_batch(documents, options=PDF_OPTIONS):
+    from pypdf import PdfWriter
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            reader, first_pages = render_documents(
+                [html_content for html_content, _ in documents], temp_dir, options
+            )
+
+            # Split the combined pdf file back into one pdf file per document
+            for index, (_, pdf_file) in enumerate(documents):
+                if index not in first_pages:
+                    print("Error while creating PDF: no pages found for " + pdf_file)
+                    continue
+
+                # The document ends where the next document found in the pdf starts
+                end = len(reader.pages)
+                for next_index in range(index + 1, len(documents)):
+                    if next_index in first_pages:
+                        end = first_pages[next_index]
+                        break
+
+                writer = PdfWriter()
+                for page_number in range(first_pages[index], end):
+                    writer.add_page(reader.pages[page_number])
+                with open(pdf_file, "wb") as file:
+                    writer.write(file)
+    except Exception as e:
+        print("Error while creating PDF:", str(e))
+
+
+# Create a single pdf file of several documents with a single wkhtmltopdf call,
+# with a bookmark for every ProductPrimaryToken and, under it, for every Token
+def create_pdf_combined(documents, pdf_file, options=PDF_OPTIONS):
+    from pypdf import PdfWriter
+
+    try:
+        with tempfile.TemporaryDirectory() as temp_dir:
+            reader, first_pages = render_documents(
+                [html_content for html_content, _, _ in documents], temp_dir, options
+            )
+
+            writer = PdfWriter()
+            for page in reader.pages:
+                writer.add_page(page)
+
+            # Add the bookmarks at the first page of every document
+            parent = None
+            parent_token = None
+            for index, (_, primary_token, token) in enumerate(documents):
+                if index not in first_pages:
+                    print("Error while creating PDF: no pages found for " + primary_token + "_" + token)
+                    continue
+
+                if parent is None or primary_token != parent_token:
+                    parent = writer.add_outline_item(primary_token, first_pages[index])
+                    parent_token = primary_token
+                writer.add_outline_item(token, first_pages[index], parent=parent)
+
+            with open(pdf_file, "wb") as file:
+                writer.write(file)
+    except Exception as e:
+        print("Error while creating PDF:", str(e))
+
+
+# Create the pdf files of a batch of documents, or a single pdf file of all the documents
+# when combined_pdf is given, record the time spent by the worker and return it
+def render_pdf(documents, worker_stats, stats_lock, combined_pdf=None, options=PDF_OPTIONS):
+    start = time.perf_counter()
+    if combined_pdf is not None:
+        create_pdf_combined(documents, combined_pdf, options)
+        pdf_files = [combined_pdf]
+    elif len(documents) == 1:
+        create_pdf(*documents[0], options)
+        pdf_files = [documents[0][1]]
+    else:
+        create_pdf_batch(documents, options)
+        pdf_files = [pdf_file for _, pdf_file in documents]
+    elapsed = time.perf_counter() - start
+
+    worker = threading.current_thread().name
+    with stats_lock:
+        count, seconds = worker_stats.get(worker, (0, 0.0))
+        worker_stats[worker] = (count + len(pdf_files), seconds + elapsed)
+
+    for pdf_file in pdf_files:
+        print("Created " + os.path.basename(pdf_file) + " (" + worker + ")")
+
+    return elapsed
+
+
+# Print the number of pdf files and the throughput of every worker
+def print_worker_stats(worker_stats, elapsed):
+    total = 0
+
+    for worker, (count, seconds) in sorted(worker_stats.items()):
+        rate = count / seconds if seconds else 0.0
+        print(f"{worker}: {count} PDFs in {seconds:.1f}s ({rate:.2f} PDFs/s)")
+        total += count
+
+    rate = total / elapsed if elapsed else 0.0
+    print(f"Total: {total} PDFs in {elapsed:.1f}s ({rate:.2f} PDFs/s)")
+
+
+# Stylesheet of the html files, a local file so that rendering needs no network access
+STYLESHEET = (Path(__file__).resolve().parent.parent / "style.css").as_uri()
+
+# Template of the html files, built once and filled in for every row
+HTML_TEMPLATE = """
+      <!DOCTYPE html>
+  <html>
+  <head>
+      <title>{Token}</title>
+      <link rel="stylesheet" href="{stylesheet}">
+  </head>
+  <body>
+      <div class="container">
+        <picture>
+            <source srcset="{Image_ProductPrimary}">
+            <img src="{Image_ProductPrimary}">
+        </picture>
+
+          <div class="info">
+              <p>Referencia de Producto: <span>{ProductPrimaryToken}</span></p>
+              <p>Nombre de Producto: <span>{Name_es}</span></p>
+              <p>Descripción de Producto:</p>
+              <p class="desc">{ProductSection_T2_INFO_es}</p>
+          </div>
+
+          <section id="bullet" class="section">
+              <h2>Bullet</h2>
+              <ul>
+                  {li_bullet_tags}
+              </ul>
+          </section>
+
+          <section class="section">
+              <h2>Caracteristicas</h2>
+                <ul>
+                    <div >
+                        {li_char_tags_1}
+                    </div>
+                    <div >
+                        {li_char_tags_2}
+                    </div>
+                </ul>
+          </section>
+
+          <section class="section">
+              <h2>Atributos</h2>
+                <ul>
+                    <div >
+                        {li_attr_tags_1}
+                    </div>
+                    <div >
+                        {li_attr_tags_2}
+                    </div>
+                </ul>
+          </section>
+      </div>
+  </body>
+  </html>
+
+      """
+
+
+# Template split once into its text and the names of its fields
+HTML_TEMPLATE_PARTS = [
+    (literal, field) for literal, field, _, _ in Formatter().parse(HTML_TEMPLATE)
+]
+
+
+# Fill in the fields of the template
+def fill_template(values):
+    parts = []
+    for literal, field in HTML_TEMPLATE_PARTS:
+        parts.append(literal)
+        if field is not None:
+            parts.append(str(values[field]))
+
+    return "".join(parts)
+
+
+# Create the <li> tags of a dictionary in a single pass, alternating between the two <div> tags
+def li_tags(items):
+    tags = [f"<li>{escape(key.replace('Attribute_', ''))}: {escape(str(val))}</li>\n\t" for key, val in items.items()]
+
+    return "".join(tags[0::2]), "".join(tags[1::2])
+
+
+# Create the <li> tags of the characteristics once, all the variants of a ProductPrimaryToken share them
+@lru_cache(maxsize=64)
+def characteristic_tags(characteristics):
+    return li_tags(dict(characteristics))
+
+
+# Create the html content of a row
+def generate_html(data):
+    # Create the <li> tags for characteristics and attributes
+    li_char_tags_1, li_char_tags_2 = characteristic_tags(
+        tuple(data["Characteristics"].items())
+    )
+    li_attr_tags_1, li_attr_tags_2 = li_tags(data["Attributes"])
+
+    # Split the bullet points by the new line character
+    bullets = data["Attribute_BulletPointsProducto"]
+    if isinstance(bullets, str):
+        bullets = [item.lstrip("- ") for item in bullets.split("\r\n")]
+    elif isinstance(bullets, float):
+        bullets = [item.lstrip("- ") for item in str(bullets).split("\r\n") if item]
+
+    # Fill in the template, the fields of the row are text and never markup
+    html_content = fill_template(
+        {
+            "stylesheet": STYLESHEET,
+            "Token": escape(str(data["Token"])),
+            "Image_ProductPrimary": escape(str(data["Image_ProductPrimary"])),
+            "ProductPrimaryToken": escape(str(data["ProductPrimaryToken"])),
+            "Name_es": escape(str(data["Name_es"])),
+            "ProductSection_T2_INFO_es": escape(str(data["ProductSection_T2_INFO_es"])),
+            "li_bullet_tags": "".join([f"<li>{escape(str(item))}</li>\n\t" for item in bullets]),
+            "li_char_tags_1": li_char_tags_1,
+            "li_char_tags_2": li_char_tags_2,
+            "li_attr_tags_1": li_attr_tags_1,
+            "li_attr_tags_2": li_attr_tags_2,
+        }
+    )
+
+    return html_content
+
+
+# Write the html content of a row to the html dump folder
+def dump_html(html_content, html_file):
+    try:
+        with open(html_file, "w", encoding="utf-8") as file:
+            file.write(html_content)
+    except Exception as e:
+        print("Error while dumping HTML:", str(e))
+
+
+# Renderer writing the html content of every row and converting it to pdf with wkhtmltopdf,
+# in a pool of threads that each run their own wkhtmltopdf process
+class HtmlRenderer(Renderer):
+    name = "html"
+
+    def __init__(self, workers=None, combine=None, batch_size=1, dump_dir=None, image_cache="image_cache",
+                 image_cache_size=500, image_max_age=24, download_workers=8, per_host=4, timeout=30,
+                 image_dpi=150, image_quality=85, **options):
+        super().__init__(workers, combine, **options)
+        self.batch_size = max(1, batch_size)  # Number of rows rendered by a single wkhtmltopdf call
+        self.dump_dir = dump_dir
+
+        # Download and normalize the images of the rows in the background, the html files point to the
+        # normalized images on disk. Without image_dpi wkhtmltopdf downloads the original images itself
+        self.image_cache = None
+        if image_dpi:
+            self.image_cache = ImageCache(
+                image_cache, image_cache_size * 1024 * 1024, image_max_age * 3600,
+                workers=download_workers, per_host=per_host, timeout=timeout, dpi=image_dpi, quality=image_quality,
+                metrics=self.metrics,
+            )
+
+        # wkhtmltopdf reads the normalized images from the image cache besides the stylesheet
+        self.pdf_options = PDF_OPTIONS
+        if self.image_cache is not None:
+            self.pdf_options = {**PDF_OPTIONS, "allow": PDF_OPTIONS["allow"] + [os.path.realpath(image_cache)]}
+
+        # Create a bounded pool of workers to render the pdf files in parallel
+        self.executor = None
+        self.pending = set()
+        self.worker_stats = {}
+        self.stats_lock = threading.Lock()
+        self.start = time.perf_counter()
+
+        if self.workers > 1:
+            print("Rendering with " + str(self.workers) + " workers...")
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="worker")
+
+        # Write the html files of the rows in the background when they are asked for
+        self.dump_executor = None
+        if dump_dir:
+            print("Dumping the html files to " + dump_dir + "...")
+            os.makedirs(dump_dir, exist_ok=True)
+            self.dump_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="dump")
+
+        # Documents waiting to be rendered together in one wkhtmltopdf call, with the records of their rows
+        self.batch = []
+        self.batch_records = []
+
+    def prefetch(self, df):
+        # Download the images of the rows in the background while the documents are created
+        if self.image_cache is not None:
+            prefetch_images(df, self.image_cache)
+
+    def cancel_prefetch(self):
+        if self.image_cache is not None:
+            self.image_cache.cancel_prefetch()
+
+    # Get the normalized image of the row from the image cache, None if the row has no image or it is not found.
+    # The image of a row is counted in the hits or misses of the cache by hash_row, render does not count it again
+    def image(self, data, count=True):
+        image_url = select_image_url(data["Image_ProductPrimary"])
+
+        return self.image_cache.get(image_url, count) if image_url is not None else None
+
+    # The normalized image of the row is part of its content hash
+    def hash_row(self, data):
+        if self.image_cache is None:
+            return hash_row(data, self.name)
+
+        image_content = self.image(data)
+        image_digest = hashlib.sha256(image_content).hexdigest() if image_content is not None else ""
+
+        return hash_row(data, self.name, image_digest)
+
+    # Data of the row pointing to its normalized image on disk, or to the placeholder of the other backends
+    # if the row has no image or it is not found, so wkhtmltopdf never downloads an image itself
+    def local_image(self, data):
+        if self.image_cache is None:
+            return data
+
+        if self.image(data, count=False) is None:
+            image_file = IMAGE_NOT_FOUND
+        else:
+            image_file = self.image_cache.derived_file(select_image_url(data["Image_ProductPrimary"]))
+
+        return {**data, "Image_ProductPrimary": Path(image_file).resolve().as_uri()}
+
+    def render(self, pdf_file, group):
+        # Create the html content of the rows and start the record of every row
+        html_contents = []
+        records = []
+        for data in group:
+            start = time.perf_counter()
+            html_data = self.local_image(data)
+            html_start = time.perf_counter()
+            html_contents.append(generate_html(html_data))
+            seconds = time.perf_counter() - html_start
+
+            self.metrics.add("html", seconds)
+            records.append(
+                {"pdf_file": pdf_file, "ProductPrimaryToken": data["ProductPrimaryToken"], "Token": data["Token"],
+                 "reused": False, "started": start, "html": seconds}
+            )
+
+        if self.dump_executor is not None:
+            for data, html_content in zip(group, html_contents):
+                html_file = data["ProductPrimaryToken"] + "_" + data["Token"] + ".html"
+                self.dump_executor.submit(dump_html, html_content, os.path.join(self.dump_dir, html_file))
+
+        # Create the pdf file path in the PDF folder of the current date folder
+        file_path = os.path.join(create_pdf_folder(), pdf_file)
+
+        print("Creating " + pdf_file + "...")
+        if self.combine:
+            # Render all the rows into the pdf file with a single wkhtmltopdf call
+            documents = [
+                (html_content, data["ProductPrimaryToken"], data["Token"])
+                for data, html_content in zip(group, html_contents)
+            ]
+            self.submit(documents, records, file_path)
+            return
+
+        # Add the document to the batch and create the pdf files once the batch is full
+        self.batch.append((html_contents[0], file_path))
+        self.batch_records.extend(records)
+        if len(self.batch) >= self.batch_size:
+            self.submit(self.batch, self.batch_records)
+            self.batch = []
+            self.batch_records = []
+
+    # Render the documents in this thread, or in a worker when there are several workers
+    def submit(self, documents, records, combined_pdf=None):
+        if self.executor is None:
+            self.render_batch(documents, records, combined_pdf)
+            return
+
+        # Wait for a worker to finish when the queue is full so rows are not read too far ahead
+        if len(self.pending) >= self.workers * 2:
+            _, self.pending = wait(self.pending, return_when=FIRST_COMPLETED)
+
+        self.pending.add(self.executor.submit(self.render_batch, documents, records, combined_pdf))
+
+    # Render the documents with a single wkhtmltopdf call and record its time and the latency of every row
+    def render_batch(self, documents, records, combined_pdf=None):
+        seconds = render_pdf(documents, self.worker_stats, self.stats_lock, combined_pdf, self.pdf_options)
+        self.metrics.add("wkhtmltopdf", seconds)
+
+        for record in records:
+            latency = time.perf_counter() - record.pop("started")
+            self.metrics.add("document", latency)
+            self.metrics.row({**record, "wkhtmltopdf": seconds, "documents": len(documents), "latency": latency})
+
+    def finish(self):
+        # Create the pdf files of the last incomplete batch
+        if self.batch:
+            self.submit(self.batch, self.batch_records)
+            self.batch = []
+            self.batch_records = []
+
+        # Wait for the remaining pdf files and report the throughput of every worker,
+        # the workers are kept for the next pdf files until the renderer is closed
+        if self.pending:
+            wait(self.pending)
+            self.pending = set()
+        if self.executor is not None or self.batch_size > 1 or self.combine:
+            print_worker_stats(self.worker_stats, time.perf_counter() - self.start)
+
+    def close(self):
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+        if self.dump_executor is not None:
+            self.dump_executor.shutdown(wait=True)
+        if self.image_cache is not None:
+            self.image_cache.close()
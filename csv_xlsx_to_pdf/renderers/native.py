@@ -0,0 +1,196 @@
+# Importing libraries
+import json
+import os
+from io import BytesIO
+
+from fpdf import FPDF
+from fpdf.fonts import FontFace
+from PIL import Image
+
+from ..images import IMAGE_NOT_FOUND
+from ..output import create_pdf_folder
+from .documents import DocumentRenderer, split_bullet_points
+
+
+# Unicode fonts embedded by the native backend for the rows with characters outside latin-1,
+# the first pair found is used, the other rows use the much faster built-in Helvetica font
+NATIVE_FONTS = [
+    ("C:/Windows/Fonts/calibri.ttf", "C:/Windows/Fonts/calibrib.ttf"),
+    ("/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+]
+NATIVE_FONT = next(
+    ((regular, bold) for regular, bold in NATIVE_FONTS if os.path.exists(regular) and os.path.exists(bold)), None
+)
+
+# Layout of the native backend, in inches like the word documents
+NATIVE_LINE_HEIGHT = 11 * 1.2 * 1.5 / 72  # 11 points font with a line spacing of 1.5
+NATIVE_HEADING_HEIGHT = 14 * 1.2 / 72  # 14 points bold font of the word headings
+NATIVE_FILL_COLOR = (214, 214, 214)  # d6d6d6 like the shading of the word documents
+
+
+# Text drawn by the native backend, the built-in Helvetica font only supports latin-1 characters
+def native_text(value, family):
+    text = str(value).replace("\t", " ")
+    if family == "helvetica":
+        text = text.encode("latin-1", "replace").decode("latin-1")
+
+    return text
+
+
+# Draw a black heading like the level 1 headings of the word documents
+def add_native_heading(pdf, family, text):
+    # Start a new page instead of leaving the heading alone at the bottom of the page, like word does
+    if pdf.will_page_break(24 / 72 + NATIVE_HEADING_HEIGHT + 2 * NATIVE_LINE_HEIGHT):
+        pdf.add_page()
+    else:
+        pdf.ln(24 / 72)
+
+    pdf.set_font(family, "B", 14)
+    pdf.cell(0, NATIVE_HEADING_HEIGHT, text, new_x="LMARGIN", new_y="NEXT")
+    pdf.set_font(family, "", 11)
+
+
+# Bold labels and values of the product information of a row
+def native_info(data):
+    return [
+        ("Referencia de Producto: ", str(data["ProductPrimaryToken"])),
+        ("Nombre de Producto: ", str(data["Name_es"])),
+        ("Descripción de Producto:\n", str(data["ProductSection_T2_INFO_es"]).replace("\n", "")),
+    ]
+
+
+# Draw the product information of a row, the lines wrap at the left margin of the text column
+def add_native_info(pdf, family, data, x, y):
+    pdf.set_left_margin(x)
+    pdf.set_xy(x, y)
+
+    for label, value in native_info(data):
+        pdf.set_font(family, "B", 11)
+        pdf.write(NATIVE_LINE_HEIGHT, native_text(label, family))
+        pdf.set_font(family, "", 11)
+        pdf.write(NATIVE_LINE_HEIGHT, native_text(value, family) + "\n")
+
+    pdf.set_left_margin(0.5)
+
+
+# Draw the items in a shaded table of 2 columns like the characteristics and attributes tables of the word documents
+def add_native_table(pdf, family, items):
+    if not items:
+        return
+
+    with pdf.table(
+        width=7,
+        col_widths=(3.5, 3.5),
+        align="LEFT",
+        text_align="LEFT",
+        v_align="MIDDLE",
+        borders_layout="NONE",
+        first_row_as_headings=False,
+        line_height=NATIVE_LINE_HEIGHT,
+        padding=(5 / 72, 0.08, 5 / 72, 0.08),
+        cell_fill_color=NATIVE_FILL_COLOR,
+        cell_fill_mode="ALL",
+    ) as table:
+        for i in range(0, len(items), 2):
+            row = table.row()
+            for item in items[i : i + 2]:
+                row.cell(native_text(item, family))
+
+            # The empty cell of the last row is not shaded
+            if i + 1 == len(items):
+                row.cell("", style=FontFace(fill_color=(255, 255, 255)))
+
+
+# Draw the pdf document of a row directly with fpdf2, without word or a converter,
+# and return the content of the pdf file, runs in a worker process
+def create_pdf_document(data, image_content):
+    # Create an A4 document with the margins of the word documents
+    pdf = FPDF(unit="in", format="A4")
+    pdf.set_margins(0.5, 1, 0.5)
+    pdf.set_auto_page_break(True, margin=1)
+    pdf.add_page()
+
+    # Embed a unicode font only when the row has characters outside latin-1
+    family = "helvetica"
+    try:
+        json.dumps(data, default=str, ensure_ascii=False).encode("latin-1")
+    except UnicodeEncodeError:
+        if NATIVE_FONT is not None:
+            family = "native"
+            pdf.add_font(family, "", NATIVE_FONT[0])
+            pdf.add_font(family, "B", NATIVE_FONT[1])
+    pdf.set_font(family, "", 11)
+
+    # Add the image of the row on the left side and the text on the right side, centered vertically
+    if image_content is not None:
+        image_data = BytesIO(image_content)
+    else:
+        image_data = IMAGE_NOT_FOUND
+
+    # Height of the image from its size and of the text from its wrapped lines
+    with Image.open(image_data) as image:
+        image_height = 3.61 * image.height / image.width
+    text_height = 0
+    for label, value in native_info(data):
+        lines = pdf.multi_cell(3.57, NATIVE_LINE_HEIGHT, native_text(label + value, family), dry_run=True, output="LINES")
+        text_height += len(lines) * NATIVE_LINE_HEIGHT
+
+    top = pdf.get_y()
+    if image_content is not None:
+        image_data.seek(0)
+    pdf.image(image_data, x=0.5, y=top + max(0, text_height - image_height) / 2, w=3.61)
+    add_native_info(pdf, family, data, 4.2, top + max(0, image_height - text_height) / 2)
+    pdf.set_xy(0.5, top + max(image_height, text_height))
+
+    # Add the bullet points on a shaded background
+    add_native_heading(pdf, family, "Bullet")
+    pdf.ln(15 / 72)
+    pdf.set_fill_color(*NATIVE_FILL_COLOR)
+    for bullet_point in split_bullet_points(data["Attribute_BulletPointsProducto"]):
+        if pdf.will_page_break(NATIVE_LINE_HEIGHT):
+            pdf.add_page()
+
+        # Draw the bullet symbol as a small black dot, it looks the same with every font
+        y = pdf.get_y()
+        pdf.multi_cell(
+            0, NATIVE_LINE_HEIGHT, "    " + native_text(bullet_point, family),
+            fill=True, align="LEFT", new_x="LMARGIN", new_y="NEXT",
+        )
+        pdf.set_fill_color(0, 0, 0)
+        pdf.circle(0.58, y + NATIVE_LINE_HEIGHT / 2 - 0.02, 0.03, style="F")
+        pdf.set_fill_color(*NATIVE_FILL_COLOR)
+    pdf.ln(15 / 72)
+
+    # Add the characteristics and attributes tables
+    add_native_heading(pdf, family, "Caracteristicas")
+    add_native_table(
+        pdf, family, [key.replace("Attribute_", "") + ": " + str(val) for key, val in data["Characteristics"].items()]
+    )
+
+    add_native_heading(pdf, family, "Atributos")
+    add_native_table(
+        pdf, family, [key.replace("Attribute_", "") + ": " + str(val) for key, val in data["Attributes"].items()]
+    )
+
+    return bytes(pdf.output())
+
+
+# Write a pdf document drawn in a worker process to the PDF folder,
+# or to the staging folder when it is merged into a combined pdf file at the end of the run
+def save_pdf_document(pdf_content, pdf_file, temp_dir, staging):
+    output_dir = temp_dir if staging else create_pdf_folder()
+    if not staging:
+        print("Creating " + pdf_file + "...")
+
+    with open(os.path.join(output_dir, pdf_file), "wb") as file:
+        file.write(pdf_content)
+
+
+# Renderer drawing the pdf document of every row directly with fpdf2 in the worker processes,
+# with the layout of the word documents but without word or a converter
+class NativeRenderer(DocumentRenderer):
+    name = "native"
+    build_document = staticmethod(create_pdf_document)
+
+    def save_document(self, content, staged_file, record):
+        save_pdf_document(content, staged_file, self.temp_dir.name, self.staging)
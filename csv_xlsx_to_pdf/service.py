@@ -0,0 +1,295 @@
+# Importing libraries
+import json
+import os
+import queue
+import socketserver
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .core import check_file_type, iter_rows, read_frame
+from .index import find_primary_tokens
+from .output import load_manifest, save_manifest
+from .pipeline import render_rows
+from .renderers import DEFAULT_BACKEND, check_renderer_options, load_renderer
+
+
+# Default port of the render service, it only listens on the local machine
+SERVICE_PORT = 8765
+
+# Number of finished jobs kept for GET /jobs/<id>, the oldest are forgotten first
+SERVICE_JOBS = 1000
+
+
+# Render service keeping a csv or xlsx file loaded with the characteristics of every row extracted, and a renderer
+# with its workers and image cache open, so the pdf files of a product are created without reading the file again.
+# The jobs are rendered one at a time by a single thread because the renderers are not thread-safe.
+# The other options are given to the renderer of the backend like with convert
+class RenderService:
+    def __init__(self, file_path, backend=DEFAULT_BACKEND, workers=None, combine=None, input_cache="input_cache",
+                 **options):
+        check_renderer_options(options)
+        check_file_type(file_path)
+        if combine == "file":
+            raise ValueError("The render service creates the pdf files of products, --combine file is not supported")
+
+        self.file_path = file_path
+        self.combine = combine
+        self.input_cache = input_cache
+        self.name = os.path.splitext(os.path.basename(file_path))[0]
+        self.renderer = load_renderer(backend)(workers=workers, combine=combine, **options)
+        self.manifest = load_manifest()
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+
+        try:
+            self.load()
+        except BaseException:
+            self.renderer.close()
+            raise
+
+        self.thread = threading.Thread(target=self.run, daemon=True)
+        self.thread.start()
+
+    # Read the file and extract the data of every row, the rows of every ProductPrimaryToken are kept together
+    def load(self):
+        start = time.perf_counter()
+        self.stat = os.stat(self.file_path)
+
+        self.df = read_frame(self.file_path, self.input_cache)
+
+        print("Extracting characteristics for every PrimaryProductToken...")
+        self.groups = {}
+        self.variants = {}
+        for data in iter_rows(self.df):
+            self.groups.setdefault(str(data["ProductPrimaryToken"]), []).append(data)
+            self.variants[str(data["Token"])] = str(data["ProductPrimaryToken"])
+
+        self.loaded = time.time()
+        print(
+            "Loaded " + str(len(self.groups)) + " products and " + str(len(self.variants)) + " rows in "
+            + str(round(time.perf_counter() - start, 2)) + " seconds"
+        )
+
+    # Read the file again if it changed since it was loaded
+    def reload_if_changed(self):
+        stat = os.stat(self.file_path)
+        if stat.st_size != self.stat.st_size or stat.st_mtime_ns != self.stat.st_mtime_ns:
+            print(self.file_path + " changed, loading it again...")
+            self.load()
+
+    # Queue a job creating the pdf files of the ProductPrimaryTokens and Tokens, or of every row when tokens is None,
+    # and return it with the event set when it is finished
+    def submit(self, tokens=None, force=False):
+        job = {
+            "id": uuid.uuid4().hex,
+            "tokens": None if tokens is None else [str(token) for token in tokens],
+            "force": bool(force),
+            "status": "queued",
+            "pdf_files": [],
+            "reused": 0,
+            "not_found": [],
+            "error": None,
+            "seconds": None,
+        }
+        done = threading.Event()
+
+        with self.lock:
+            self.jobs[job["id"]] = job
+
+            # Forget the oldest finished jobs
+            finished = [job_id for job_id, other in self.jobs.items() if other["status"] in ("done", "failed")]
+            for job_id in finished[: max(0, len(finished) - SERVICE_JOBS)]:
+                del self.jobs[job_id]
+
+        self.queue.put((job, done))
+
+        return job, done
+
+    # Create the pdf files of the ProductPrimaryTokens and Tokens and return the finished job
+    def render(self, tokens, force=False):
+        job, done = self.submit(tokens, force)
+        done.wait()
+
+        return self.job(job["id"])
+
+    # Copy of a job, None if it is not known
+    def job(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+            return None if job is None else dict(job)
+
+    # State of the service
+    def status(self):
+        with self.lock:
+            jobs = [job["status"] for job in self.jobs.values()]
+
+        return {
+            "file": self.file_path,
+            "products": len(self.groups),
+            "rows": len(self.variants),
+            "loaded": self.loaded,
+            "queued": jobs.count("queued") + jobs.count("running"),
+        }
+
+    # Rows of a job, all the rows of a ProductPrimaryToken and only the row of a Token.
+    # Only the images of the rows of the job are prefetched, so a single product does not wait
+    # for the images of the whole file
+    def job_rows(self, job):
+        if job["tokens"] is None:
+            self.renderer.prefetch(self.df)
+            return [data for primary_token in sorted(self.groups) for data in self.groups[primary_token]]
+
+        primary_tokens, job["not_found"] = find_primary_tokens(job["tokens"], self.groups, self.variants)
+        rows = [
+            data
+            for primary_token in sorted(primary_tokens)
+            for data in self.groups[primary_token]
+            if primary_token in job["tokens"] or str(data["Token"]) in job["tokens"]
+        ]
+        self.renderer.prefetch(self.df[self.df["Token"].astype(str).isin({str(data["Token"]) for data in rows})])
+        return rows
+
+    # Render the queued jobs one at a time until the service is closed
+    def run(self):
+        while True:
+            item = self.queue.get()
+            if item is None:
+                return
+            job, done = item
+
+            start = time.perf_counter()
+            with self.lock:
+                job["status"] = "running"
+            try:
+                self.reload_if_changed()
+                job["pdf_files"], job["reused"] = render_rows(
+                    self.renderer, self.job_rows(job), self.combine, self.name, self.manifest, job["force"]
+                )
+                status = "done"
+            except Exception as e:
+                print("Error while rendering job " + job["id"] + ":", str(e))
+                job["error"] = str(e)
+                status = "failed"
+
+            with self.lock:
+                job["status"] = status
+                job["seconds"] = time.perf_counter() - start
+            done.set()
+
+            # Save the content hashes after answering, they are saved before the next job is rendered
+            if status == "done":
+                save_manifest(self.manifest)
+
+    # Finish the queued jobs, stop the render thread and release the renderer
+    def close(self):
+        self.queue.put(None)
+        self.thread.join()
+        self.renderer.close()
+
+
+# HTTP API of the render service, the requests and responses are JSON:
+# GET /health, POST /render {"tokens": [...], "force": false} waits for the pdf files,
+# POST /jobs {"tokens": [...]} queues a job, every row without tokens, and GET /jobs/<id> gives its state
+class ServiceHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        service = self.server.service
+
+        if self.path == "/health":
+            self.send_json(200, service.status())
+        elif self.path.startswith("/jobs/"):
+            job = service.job(self.path[len("/jobs/"):])
+            if job is None:
+                self.send_json(404, {"error": "job not found"})
+            else:
+                self.send_json(200, job)
+        else:
+            self.send_json(404, {"error": "unknown path " + self.path})
+
+    def do_POST(self):
+        service = self.server.service
+
+        # Read the JSON body of the request
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            body = json.loads(self.rfile.read(length) or b"{}")
+            tokens = body.get("tokens")
+            if tokens is not None and (not isinstance(tokens, list) or not tokens):
+                raise ValueError("tokens must be a list of ProductPrimaryTokens or Tokens")
+            force = body.get("force", False)
+            if not isinstance(force, bool):
+                raise ValueError("force must be true or false")
+        except (ValueError, AttributeError) as e:
+            self.send_json(400, {"error": str(e)})
+            return
+
+        if self.path == "/render":
+            if tokens is None:
+                self.send_json(400, {"error": "tokens are required, queue a job to render every row"})
+                return
+
+            job = service.render(tokens, force)
+            if job["status"] == "failed":
+                self.send_json(500, job)
+            elif not job["pdf_files"]:
+                self.send_json(404, job)
+            else:
+                self.send_json(200, job)
+        elif self.path == "/jobs":
+            job, _ = service.submit(tokens, force)
+            self.send_json(202, service.job(job["id"]))
+        else:
+            self.send_json(404, {"error": "unknown path " + self.path})
+
+    def send_json(self, code, content):
+        body = json.dumps(content).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    # The requests are not logged
+    def log_message(self, format, *args):
+        pass
+
+
+# Create the HTTP server of the render service on the local port, or on a Unix socket when socket_path is given
+def create_server(service, port=SERVICE_PORT, socket_path=None):
+    if socket_path:
+        # Unix sockets are not available on Windows
+        if not hasattr(socketserver, "ThreadingUnixStreamServer"):
+            raise ValueError("Unix sockets are not supported on this system, use --port")
+
+        class UnixHTTPServer(socketserver.ThreadingUnixStreamServer):
+            daemon_threads = True
+
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        server = UnixHTTPServer(socket_path, ServiceHandler)
+    else:
+        server = ThreadingHTTPServer(("127.0.0.1", port), ServiceHandler)
+
+    server.service = service
+    return server
+
+
+# Load the file and serve the render service until the program is interrupted
+def serve(file_path, port=SERVICE_PORT, socket_path=None, **options):
+    service = RenderService(file_path, **options)
+    try:
+        server = create_server(service, port, socket_path)
+        try:
+            if socket_path:
+                print("Serving " + file_path + " on " + socket_path)
+            else:
+                print("Serving " + file_path + " on http://127.0.0.1:" + str(server.server_address[1]))
+            server.serve_forever()
+        finally:
+            server.server_close()
+            if socket_path and os.path.exists(socket_path):
+                os.remove(socket_path)
+    finally:
+        service.close()
@@ -0,0 +1,159 @@
+# Importing libraries
+import glob
+import json
+import os
+import zlib
+
+from .output import MANIFEST_FILE, load_manifest, save_manifest
+
+
+# Folder of the manifests of the shards, copied with the PDF folders of every machine before they are merged
+SHARDS_DIR = "PDF/shards"
+
+
+# Shard of a ProductPrimaryToken, from 1 to count. crc32 gives the same shard on every machine and every run,
+# unlike hash() which changes with every python process
+def shard_of(primary_token, count):
+    return zlib.crc32(str(primary_token).encode("utf-8")) % count + 1
+
+
+# Rows of the DataFrame in the shard, all the rows of a ProductPrimaryToken are always in the same shard
+def select_shard(df, shard):
+    index, count = shard
+    primary_tokens = df["ProductPrimaryToken"].astype(str)
+    shards = {primary_token: shard_of(primary_token, count) for primary_token in primary_tokens.unique()}
+
+    return df[primary_tokens.map(shards) == index].reset_index(drop=True)
+
+
+# Name of the output of a shard, the catalogue of a shard with --combine file is <name>-<i>-of-<N>.pdf
+def shard_name(name, shard):
+    return name + "-" + str(shard[0]) + "-of-" + str(shard[1])
+
+
+# Path of the manifest of a shard of the input file
+def shard_manifest_path(name, shard):
+    return os.path.join(SHARDS_DIR, shard_name(name, shard) + ".json")
+
+
+# Load the content hashes of the pdf files of the shard, or of the merged manifest before the first sharded run
+def load_shard_manifest(name, shard):
+    path = shard_manifest_path(name, shard)
+    if not os.path.exists(path):
+        return load_manifest()
+
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)["files"]
+    except (ValueError, KeyError):
+        print("Shard manifest is corrupted, creating every pdf file of the shard again...")
+        return {}
+
+
+# Save the content hashes of the pdf files of the shard, only the pdf files of this run
+def save_shard_manifest(name, shard, combine, manifest, pdf_files):
+    os.makedirs(SHARDS_DIR, exist_ok=True)
+    content = {
+        "file": name,
+        "shard": list(shard),
+        "combine": combine,
+        "files": {os.path.basename(pdf_file): manifest[os.path.basename(pdf_file)] for pdf_file in pdf_files},
+    }
+
+    with open(shard_manifest_path(name, shard), "w", encoding="utf-8") as file:
+        json.dump(content, file)
+
+
+# Pdf files expected from the input file, with the shard that creates each of them
+def expected_pdf_files(df, combine, name, count):
+    primary_tokens = df["ProductPrimaryToken"].astype(str)
+    shards = {primary_token: shard_of(primary_token, count) for primary_token in primary_tokens.unique()}
+
+    if combine == "file":
+        return {shard_name(name, (index, count)) + ".pdf": index for index in set(shards.values())}
+    if combine == "token":
+        return {primary_token + ".pdf": index for primary_token, index in shards.items()}
+
+    return {
+        primary_token + "_" + token + ".pdf": shards[primary_token]
+        for primary_token, token in zip(primary_tokens, df["Token"].astype(str))
+    }
+
+
+# Check the manifests of the shards of the input file against the file: every shard is there, every pdf file
+# of the file was created by its shard and exists, and no pdf file was created by two shards.
+# Without problems the content hashes are merged into the manifest so the next runs reuse the pdf files.
+# Return the problems found
+def merge_shards(file_path, input_cache=None):
+    from .core import read_frame
+
+    name = os.path.splitext(os.path.basename(file_path))[0]
+    problems = []
+
+    # Load the manifests of the shards of the file
+    shard_manifests = {}
+    for path in sorted(glob.glob(os.path.join(SHARDS_DIR, glob.escape(name) + "-*-of-*.json"))):
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                content = json.load(file)
+        except ValueError:
+            problems.append("Shard manifest " + path + " is corrupted")
+            continue
+        if content.get("file") == name:
+            shard_manifests[tuple(content["shard"])] = content
+
+    if not shard_manifests:
+        return problems + ["No shard manifest found for " + file_path + " in " + SHARDS_DIR]
+
+    # Every shard of the same split must be there, with the same outputs
+    counts = sorted({count for _, count in shard_manifests})
+    if len(counts) > 1:
+        return problems + ["Shard manifests of different splits: " + ", ".join(str(count) for count in counts)
+                           + " shards, remove the outdated ones"]
+    count = counts[0]
+    for index in range(1, count + 1):
+        if (index, count) not in shard_manifests:
+            problems.append("Shard " + str(index) + "/" + str(count) + " is missing")
+
+    combines = {content["combine"] for content in shard_manifests.values()}
+    if len(combines) > 1:
+        return problems + ["Shards created with different --combine options"]
+    combine = combines.pop()
+
+    # Every pdf file must be created by a single shard and exist in its date folder
+    merged = {}
+    created_by = {}
+    for (index, _), content in sorted(shard_manifests.items()):
+        for pdf_file, entry in content["files"].items():
+            if pdf_file in created_by:
+                problems.append(pdf_file + " is created by shards " + str(created_by[pdf_file]) + " and " + str(index))
+                continue
+            created_by[pdf_file] = index
+            merged[pdf_file] = entry
+            if not os.path.exists("PDF/" + entry["date"] + "/" + pdf_file):
+                problems.append(pdf_file + " of shard " + str(index) + " is missing from PDF/" + entry["date"])
+
+    # Every pdf file of the input file must be created by the shard of its ProductPrimaryToken
+    expected = expected_pdf_files(read_frame(file_path, input_cache), combine, name, count)
+    for pdf_file, index in sorted(expected.items()):
+        if pdf_file not in created_by:
+            if (index, count) in shard_manifests:
+                problems.append(pdf_file + " was not created by shard " + str(index))
+        elif created_by[pdf_file] != index:
+            problems.append(
+                pdf_file + " is created by shard " + str(created_by[pdf_file]) + " instead of " + str(index)
+            )
+    for pdf_file in sorted(set(created_by) - set(expected)):
+        problems.append(pdf_file + " of shard " + str(created_by[pdf_file]) + " is not in " + file_path)
+
+    if problems:
+        return problems
+
+    # Merge the content hashes of the shards into the manifest
+    manifest = load_manifest()
+    manifest.update(merged)
+    save_manifest(manifest)
+    print("Merged " + str(count) + " shards of " + file_path + " with " + str(len(merged)) + " pdf files into "
+          + MANIFEST_FILE)
+
+    return problems
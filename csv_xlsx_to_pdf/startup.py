@@ -0,0 +1,46 @@
+# Importing libraries
+import builtins
+import sys
+import threading
+import time
+
+
+# Record the time spent importing every library the first time it is imported during the run.
+# The libraries imported by a library while it is being imported are counted in its time
+class ImportProfiler:
+    def __init__(self):
+        self.timings = {}
+        self.local = threading.local()  # Set while an import is being timed in the thread
+        self.lock = threading.Lock()
+        self.original_import = builtins.__import__
+
+    # Time the import statements until stop is called
+    def start(self):
+        builtins.__import__ = self.timed_import
+
+    def stop(self):
+        builtins.__import__ = self.original_import
+
+    # Import a module like the import statement and time it if its library was not imported yet
+    def timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        library = name.partition(".")[0]
+        if level != 0 or library in sys.modules or getattr(self.local, "timing", False):
+            return self.original_import(name, globals, locals, fromlist, level)
+
+        self.local.timing = True
+        start = time.perf_counter()
+        try:
+            return self.original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.local.timing = False
+            if library in sys.modules:
+                with self.lock:
+                    self.timings[library] = self.timings.get(library, 0.0) + elapsed
+
+    # Print the import time of every library, the slowest first
+    def report(self):
+        print("Import timings:")
+        for library, seconds in sorted(self.timings.items(), key=lambda item: item[1], reverse=True):
+            print(f"{library:>20}  {seconds * 1000:>8.1f} ms")
+        print(f"{'total':>20}  {sum(self.timings.values()) * 1000:>8.1f} ms")
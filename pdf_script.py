@@ -0,0 +1,6 @@
+# Convert a csv or xlsx file to pdf files, run python pdf_script.py --help for the options
+from csv_xlsx_to_pdf.cli import main
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+# Importing libraries
+import os
+
+import numpy as np
+import pandas as pd
+
+from csv_xlsx_to_pdf.core import extract_characteristics, read_frame
+
+
+# Bundled csv file of the repository
+DATA_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data.csv")
+
+
+# Previous implementation of extract_characteristics, filtering the whole DataFrame for every token
+def extract_characteristics_per_token(att_col, primary_tokens):
+    # Create a dictionary for the characteristics of all tokens
+    all_characteristics = {}
+
+    for primary_token in primary_tokens:
+        # Get the rows with the same ProductPrimaryToken
+        specific_rows = att_col[att_col["ProductPrimaryToken"] == primary_token]
+        specific_df = pd.DataFrame(specific_rows)
+
+        # Create a dictionary with the characteristics of the specific ProductPrimaryToken
+        characteristics = {}
+
+        # Iterate over the columns in the specific DataFrame
+        for column in specific_df.columns:
+            if column != "ProductPrimaryToken":  # Exclude the "ProductPrimaryToken" column
+                # Check the number of unique values in the column
+                num_unique_values = specific_df[column].nunique()
+
+                if num_unique_values == 1:
+                    value = specific_df[column].iloc[0]
+                    if pd.notna(value) and value != "" and value != "None":
+                        characteristics[column] = value
+
+        all_characteristics[primary_token] = characteristics
+
+    return all_characteristics
+
+
+# Attribute columns of the rows of the ProductPrimaryTokens with several rows, like iter_rows
+def attribute_columns(df):
+    attribute_columns = df.filter(regex="^(?!Attribute_BulletPointsProducto|Attribute_Estado)(Attribute_)").copy()
+    attribute_columns["ProductPrimaryToken"] = df["ProductPrimaryToken"]
+
+    return attribute_columns[attribute_columns.duplicated(subset="ProductPrimaryToken", keep=False)]
+
+
+# The grouped implementation gives the same characteristics as the per-token loop on the bundled data
+def test_extract_characteristics_matches_per_token_loop():
+    df = read_frame(DATA_FILE)
+    att_col = attribute_columns(df)
+    primary_tokens = df["ProductPrimaryToken"].unique()
+
+    expected = extract_characteristics_per_token(att_col, primary_tokens)
+    result = extract_characteristics(att_col, primary_tokens)
+
+    assert len(result) == len(primary_tokens)
+    assert result == expected
+    assert any(result.values())
+
+
+# The values "None", "" and NaN are never characteristics, like the per-token loop a column with a single value
+# and empty values is one when its first value is not empty
+def test_extract_characteristics_filters_empty_values():
+    att_col = pd.DataFrame({
+        "ProductPrimaryToken": ["A", "A", "B", "B", "C"],
+        "Attribute_Color": ["Red", "Red", "Blue", "Green", "Red"],
+        "Attribute_None": ["None", "None", "None", "None", "None"],
+        "Attribute_Empty": ["", "", "", "", ""],
+        "Attribute_NaN": [np.nan, np.nan, np.nan, np.nan, np.nan],
+        "Attribute_Partial": [np.nan, "10", "5", "5", np.nan],
+        "Attribute_Size": [1.5, 1.5, 2.0, 2.0, 3.0],
+    })
+    primary_tokens = ["A", "B", "C", "D"]
+
+    result = extract_characteristics(att_col, primary_tokens)
+
+    assert result == extract_characteristics_per_token(att_col, primary_tokens)
+    assert result == {
+        "A": {"Attribute_Color": "Red", "Attribute_Size": 1.5},
+        "B": {"Attribute_Partial": "5", "Attribute_Size": 2.0},
+        "C": {"Attribute_Color": "Red", "Attribute_Size": 3.0},
+        "D": {},
+    }
@@ -0,0 +1,109 @@
+# Importing libraries
+import re
+from pathlib import Path
+
+import pytest
+
+from csv_xlsx_to_pdf.core import iter_rows, read_frame
+from csv_xlsx_to_pdf.images import IMAGE_NOT_FOUND
+from tests.test_characteristics import DATA_FILE
+
+pytest.importorskip("pdfkit")
+
+from pypdf import PdfReader, PdfWriter  # noqa: E402
+from pypdf.annotations import Link  # noqa: E402
+
+from csv_xlsx_to_pdf.renderers.html import (  # noqa: E402
+    PDF_OPTIONS, STYLE_DIR, HtmlRenderer, create_pdf_batch, create_pdf_combined, generate_html,
+)
+
+
+# First row of data.csv
+@pytest.fixture(scope="module")
+def row():
+    return next(iter_rows(read_frame(DATA_FILE, None)))
+
+
+# The fields of a row are escaped, markup from the feed cannot add elements reading local files
+def test_fields_are_escaped(row):
+    markup = '<img src="file:///etc/passwd">'
+    html_content = generate_html(
+        {**row, "Name_es": markup, "ProductSection_T2_INFO_es": "<10 lux & more",
+         "Attribute_BulletPointsProducto": markup, "Attributes": {"Attribute_" + markup: markup}}
+    )
+
+    assert "file:///etc/passwd" in html_content
+    assert "<img src=\"file:" not in html_content
+    assert "&lt;10 lux &amp; more" in html_content
+
+
+# wkhtmltopdf can only read the local files of the stylesheet folder
+def test_local_file_access():
+    assert "enable-local-file-access" not in PDF_OPTIONS
+    assert "disable-local-file-access" in PDF_OPTIONS
+    assert PDF_OPTIONS["allow"] == [STYLE_DIR]
+
+
+# With the image cache, a row whose image is not found points to the placeholder instead of its url,
+# so wkhtmltopdf does not download it again without the timeout of the image cache
+def test_missing_image_placeholder(row, tmp_path):
+    renderer = HtmlRenderer(image_cache=str(tmp_path / "image_cache"))
+    try:
+        url = "http://127.0.0.1:9/missing.jpg"
+        renderer.image_cache.missing.add(url)
+        html_content = generate_html(renderer.local_image({**row, "Image_ProductPrimary": url}))
+    finally:
+        renderer.close()
+
+    assert url not in html_content
+    assert Path(IMAGE_NOT_FOUND).resolve().as_uri() in html_content
+
+
+# Stand-in for wkhtmltopdf rendering every html file on index % 2 + 1 pages, with the links of the html file
+# as link annotations of its first page
+def fake_from_file(html_files, pdf_file, options=None):
+    writer = PdfWriter()
+    for index, html_file in enumerate(html_files):
+        with open(html_file, "r", encoding="utf-8") as file:
+            urls = re.findall(r'href="(https?://[^"]+)"', file.read()) + ["https://example.com/" + str(index)]
+
+        first_page = len(writer.pages)
+        for _ in range(index % 2 + 1):
+            writer.add_blank_page(595, 842)
+        for url in urls:
+            writer.add_annotation(first_page, Link(rect=(0, 841, 1, 842), url=url))
+
+    with open(pdf_file, "wb") as file:
+        writer.write(file)
+
+
+# Links of the annotations of a page
+def page_links(page):
+    return [annotation.get_object()["/A"]["/URI"] for annotation in page.get("/Annots", [])]
+
+
+# The documents of a batch are split at the batch markers, which are removed from the pdf files
+def test_batch_split(row, tmp_path, monkeypatch):
+    monkeypatch.setattr("pdfkit.from_file", fake_from_file)
+    documents = [(generate_html(row), str(tmp_path / (str(index) + ".pdf"))) for index in range(5)]
+
+    create_pdf_batch(documents)
+
+    for index, (_, pdf_file) in enumerate(documents):
+        pages = PdfReader(pdf_file).pages
+        assert len(pages) == index % 2 + 1
+        assert page_links(pages[0]) == ["https://example.com/" + str(index)]
+        with open(pdf_file, "rb") as file:
+            assert b"batch" not in file.read()
+
+    combined_pdf = str(tmp_path / "combined.pdf")
+    create_pdf_combined([(html_content, "P", str(index)) for index, (html_content, _) in enumerate(documents)],
+                        combined_pdf)
+
+    reader = PdfReader(combined_pdf)
+    assert [reader.get_destination_page_number(item) for item in reader.outline[1]] == [0, 1, 3, 4, 6]
+    assert [link for page in reader.pages for link in page_links(page)] == [
+        "https://example.com/" + str(index) for index in range(5)
+    ]
+    with open(combined_pdf, "rb") as file:
+        assert b"batch" not in file.read()
@@ -0,0 +1,216 @@
+# Importing libraries
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+import pytest
+
+from csv_xlsx_to_pdf.images import ImageCache, prefetch_images, select_image_url
+
+
+# Local stand-in for the image server: /missing/ answers 404, /slow/ answers after a delay,
+# every other path answers its own content. It counts the requests of every path and the most
+# requests running at the same time
+class ImageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests[self.path] = server.requests.get(self.path, 0) + 1
+            server.running += 1
+            server.max_running = max(server.max_running, server.running)
+
+        try:
+            if self.path.startswith("/slow/"):
+                time.sleep(server.delay)
+            if self.path.startswith("/missing/"):
+                self.send_response(404)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            content = ("image " + self.path).encode("utf-8") * 100
+            self.send_response(200)
+            self.send_header("Content-Type", "image/jpeg")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        finally:
+            with server.lock:
+                server.running -= 1
+
+    # The requests are not logged
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def image_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ImageHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = {}
+    server.running = 0
+    server.max_running = 0
+    server.delay = 0.2
+    server.url = "http://127.0.0.1:" + str(server.server_address[1])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+# Image cache in a temporary folder, closed at the end of the test
+@pytest.fixture
+def make_cache(tmp_path):
+    caches = []
+
+    def make_cache(**options):
+        cache = ImageCache(str(tmp_path / "image_cache"), **options)
+        caches.append(cache)
+        return cache
+
+    yield make_cache
+
+    for cache in caches:
+        cache.close()
+
+
+# The secondary image is only used when there is no primary image
+def test_select_image_url_fallback():
+    assert select_image_url("http://a/1.jpg,http://a/2.jpg") == "http://a/1.jpg"
+    assert select_image_url("None,http://a/2.jpg") == "http://a/2.jpg"
+    assert select_image_url("nan,http://a/2.jpg") == "http://a/2.jpg"
+    assert select_image_url("http://a/1.jpg") == "http://a/1.jpg"
+    assert select_image_url("None") is None
+    assert select_image_url(float("nan")) is None
+    assert select_image_url("None,None") is None
+
+
+# Every unique url of the rows is downloaded once in the background, the secondary image of a row
+# without a primary image included, and the documents get them without any other request
+def test_prefetch_downloads_every_unique_url_once(image_server, make_cache):
+    url = image_server.url
+    df = pd.DataFrame({
+        "Image_ProductPrimary": [
+            url + "/1.jpg," + url + "/2.jpg",
+            url + "/1.jpg",
+            "None," + url + "/3.jpg",
+            float("nan"),
+        ]
+    })
+    cache = make_cache(workers=4)
+
+    prefetch_images(df, cache)
+    for future in list(cache.futures.values()):
+        future.result()
+    assert image_server.requests == {"/1.jpg": 1, "/3.jpg": 1}
+
+    assert cache.get(url + "/1.jpg") == b"image /1.jpg" * 100
+    assert cache.get(url + "/3.jpg") == b"image /3.jpg" * 100
+    assert image_server.requests == {"/1.jpg": 1, "/3.jpg": 1}
+
+    # The downloads in the background are the lookups of the documents, they are not counted again
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+# The prefetched images are not evicted before they are used when they do not fit in the cache,
+# so every image is downloaded only once
+def test_prefetch_bigger_than_cache(image_server, make_cache):
+    urls = [image_server.url + "/" + str(i).zfill(2) + ".jpg" for i in range(40)]
+    size = len(b"image /00.jpg" * 100)
+    cache = make_cache(workers=8, max_size=size * 10, memory_items=4)
+
+    cache.prefetch(urls)
+    for url in urls:
+        assert cache.get(url) is not None
+
+    assert sum(image_server.requests.values()) == 40
+
+    # The images downloaded ahead of their documents are evicted at the end of the run
+    cache.close()
+    assert len(cache.index) <= 10
+
+
+# No more than per_host downloads run at the same time on the same host
+def test_per_host_limit(image_server, make_cache):
+    urls = [image_server.url + "/slow/" + str(i) + ".jpg" for i in range(8)]
+    cache = make_cache(workers=8, per_host=2)
+
+    cache.prefetch(urls)
+    for url in urls:
+        assert cache.get(url) is not None
+
+    assert image_server.max_running == 2
+
+
+# A download slower than the timeout is abandoned, the image is treated as not found
+# and it is not requested again during the run
+def test_timeout(image_server, make_cache):
+    image_server.delay = 2
+    url = image_server.url + "/slow/1.jpg"
+    cache = make_cache(timeout=0.2)
+
+    start = time.perf_counter()
+    assert cache.get(url) is None
+    assert time.perf_counter() - start < 1.5
+
+    assert cache.get(url) is None
+    assert image_server.requests == {"/slow/1.jpg": 1}
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+# A missing image is not found and it is not requested again during the run
+def test_missing_image(image_server, make_cache):
+    url = image_server.url + "/missing/1.jpg"
+    cache = make_cache()
+
+    assert cache.get(url) is None
+    assert cache.get(url) is None
+    assert image_server.requests == {"/missing/1.jpg": 1}
+    assert (cache.hits, cache.misses) == (0, 2)
+
+    # The second lookup of the image of the same row is not counted
+    assert cache.get(url, count=False) is None
+    assert (cache.hits, cache.misses) == (0, 2)
+
+
+# The images are kept on disk for the next runs
+def test_disk_cache_between_runs(image_server, make_cache):
+    url = image_server.url + "/1.jpg"
+
+    first = make_cache()
+    assert first.get(url) is not None
+    first.close()
+
+    second = make_cache()
+    assert second.get(url) == b"image /1.jpg" * 100
+    assert image_server.requests == {"/1.jpg": 1}
+    assert second.hits == 1
+
+
+# The size of the cache counted while the images are downloaded and normalized is the size of the files on disk,
+# and the normalized images left without their image are removed by the next run
+def test_cache_size_matches_disk(image_server, make_cache, tmp_path):
+    urls = [image_server.url + "/" + str(i).zfill(2) + ".jpg" for i in range(20)]
+    size = len(b"image /00.jpg" * 100)
+
+    def disk_size():
+        return sum(path.stat().st_size for path in (tmp_path / "image_cache").rglob("*") if path.name != "index.json"
+                   and path.is_file())
+
+    cache = make_cache(max_size=size * 10, dpi=150)
+    for url in urls:
+        assert cache.get(url) is not None
+    cache.close()
+    assert cache.total_size == disk_size() <= size * 10
+
+    (tmp_path / "image_cache" / "derived" / ("0" * 64 + "-150-85")).write_bytes(b"orphan")
+    cache = make_cache(max_size=size * 10, dpi=100)
+    assert cache.get(urls[-1]) is not None
+    assert cache.total_size == disk_size() == sum(cache.entry_size(entry) for entry in cache.index.values())
@@ -0,0 +1,24 @@
+# Importing libraries
+import inspect
+
+import pytest
+
+from csv_xlsx_to_pdf import convert
+from csv_xlsx_to_pdf.renderers import RENDERER_OPTIONS, RENDERERS, load_renderer
+
+
+# Every option of the renderers is known by convert, and no other name
+def test_renderer_options():
+    options = set()
+    for backend in RENDERERS:
+        for cls in inspect.getmro(load_renderer(backend))[:-1]:
+            if "__init__" in vars(cls):
+                options.update(inspect.signature(cls.__init__).parameters)
+
+    assert options - {"self", "workers", "combine", "metrics", "options"} == RENDERER_OPTIONS
+
+
+# A misspelled option of convert is an error instead of being ignored by the renderer
+def test_convert_unknown_option():
+    with pytest.raises(TypeError, match="dump_html"):
+        convert("data.csv", dump_html="html")
@@ -0,0 +1,127 @@
+# Importing libraries
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+
+import pandas as pd
+import pytest
+from PIL import Image
+
+from csv_xlsx_to_pdf.cli import main
+from csv_xlsx_to_pdf.core import read_frame
+from csv_xlsx_to_pdf.service import RenderService, create_server
+from tests.test_characteristics import DATA_FILE
+
+
+# Local stand-in for the image server answering a small png image for every path and counting the requests
+class PngHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        with self.server.lock:
+            self.server.requests[self.path] = self.server.requests.get(self.path, 0) + 1
+
+        self.send_response(200)
+        self.send_header("Content-Type", "image/png")
+        self.send_header("Content-Length", str(len(self.server.content)))
+        self.end_headers()
+        self.wfile.write(self.server.content)
+
+    # The requests are not logged
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def png_server():
+    output = BytesIO()
+    Image.new("RGB", (40, 30), (200, 80, 80)).save(output, "PNG")
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), PngHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.requests = {}
+    server.content = output.getvalue()
+    server.url = "http://127.0.0.1:" + str(server.server_address[1])
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    yield server
+
+    server.shutdown()
+    server.server_close()
+
+
+# Render service of the products of data.csv with the most variants, every row with its own image on the local server
+@pytest.fixture
+def service(tmp_path, monkeypatch, png_server):
+    df = read_frame(DATA_FILE, None)
+    primary_tokens = df["ProductPrimaryToken"].astype(str).value_counts().index[:3]
+    df = df[df["ProductPrimaryToken"].astype(str).isin(primary_tokens)].reset_index(drop=True)
+    df["Image_ProductPrimary"] = [png_server.url + "/" + str(token) + ".png" for token in df["Token"]]
+    df.to_csv(tmp_path / "products.csv", sep=";", index=False)
+
+    monkeypatch.chdir(tmp_path)
+    service = RenderService(
+        "products.csv", backend="native", workers=1, input_cache=None, image_cache=str(tmp_path / "image_cache"),
+        download_workers=1,
+    )
+
+    yield service
+
+    service.close()
+
+
+# Single Token jobs only download the images of their rows, and leave no prefetched image behind
+# that would block the prefetch of the next jobs or stay pinned in the cache
+def test_single_token_jobs(service, png_server):
+    image_cache = service.renderer.image_cache
+    tokens = [str(token) for token in pd.read_csv("products.csv", sep=";")["Token"]]
+    assert len(tokens) > image_cache.ahead
+
+    for token in tokens[:20]:
+        job = service.render([token])
+
+        assert job["status"] == "done", job["error"]
+        assert len(job["pdf_files"]) == 1
+        assert not image_cache.futures
+        assert not image_cache.pinned
+        assert not image_cache.queued
+
+    assert sorted(png_server.requests) == sorted("/" + token + ".png" for token in tokens[:20])
+
+
+# force is a JSON boolean, the string "false" is rejected instead of forcing the pdf files
+def test_force_must_be_boolean(service):
+    server = create_server(service, 0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    token = str(pd.read_csv("products.csv", sep=";")["Token"][0])
+
+    def post(force):
+        request = urllib.request.Request(
+            "http://127.0.0.1:" + str(server.server_address[1]) + "/render", method="POST",
+            data=json.dumps({"tokens": [token], "force": force}).encode("utf-8"),
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status
+        except urllib.error.HTTPError as e:
+            return e.code
+
+    try:
+        assert [post(force) for force in ("false", 1, None, False, True)] == [400, 400, 400, 200, 200]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# The options of a run that the jobs of the service would ignore are rejected
+@pytest.mark.parametrize(
+    "option", [["--force"], ["--stream"], ["--sorted"], ["--only", "1WD4"], ["--chunk-size", "10"]]
+)
+def test_serve_rejects_run_options(option):
+    with pytest.raises(SystemExit) as error:
+        main([DATA_FILE, "--serve"] + option)
+
+    assert error.value.code == 2